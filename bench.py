@@ -0,0 +1,169 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from graph_algorithms import AlgorithmsFactory
+from input_factory import AbstractInputFactory, AlgorithmType, InputType, DagInput, ErdosRenyiInput
+from solvers import Engine
+
+DEFAULT_SIZES = [100, 1000]
+DEFAULT_DENSITIES = [2, 8]
+# dense layouts and all-pairs tables are O(V^2), so they only run up to this many nodes
+MATRIX_LIMIT = 2000
+# the pure-Python matrix Bellman-Ford is O(V^3) and would dominate the suite, so it runs vectorised
+DEFAULT_ENGINES = {(AlgorithmType.BELLMAN_FORD, InputType.ADJACENCY_MATRIX): Engine.NUMPY}
+# these answer for the whole graph when called without a start; BRIDGES also finds the articulation points in that pass
+WHOLE_GRAPH = {AlgorithmType.CONNECTED_COMPONENTS, AlgorithmType.STRONGLY_CONNECTED_COMPONENTS, AlgorithmType.BRIDGES}
+
+
+class BenchmarkInputFactory(AbstractInputFactory):
+	def __init__(self, input_type: InputType, n_nodes: int, n_edges: int, seed: int):
+		self.input_type = input_type
+		self.n_nodes = n_nodes
+		self.n_edges = n_edges
+		self.seed = seed
+
+	def get_input(self, for_algorithm: AlgorithmType) -> list | dict:
+		match for_algorithm:
+			case AlgorithmType.KAHNS:
+				return DagInput(self.input_type, self.n_nodes, self.n_edges, self.seed).generate()
+			case AlgorithmType.KRUSKAL | AlgorithmType.PRIMS | AlgorithmType.BORUVKA | AlgorithmType.CONNECTED_COMPONENTS | AlgorithmType.BRIDGES:
+				return ErdosRenyiInput(self.input_type, self.n_nodes, self.n_edges // 2, self.seed, undirected=True).generate()
+			case _:
+				return ErdosRenyiInput(self.input_type, self.n_nodes, self.n_edges, self.seed).generate()
+
+
+def run_case(algorithm_type: AlgorithmType, input_type: InputType, n_nodes: int, n_edges: int, repeats: int = 3, seed: int = 0, memory: bool = False) -> dict:
+	algorithm = AlgorithmsFactory.get_algorithm(algorithm_type)
+	algorithm.set_input_type(input_type)
+	engine = DEFAULT_ENGINES.get((algorithm_type, input_type))
+	if engine is not None:
+		algorithm.set_engine(engine)
+	algorithm.set_input_factory(BenchmarkInputFactory(input_type, n_nodes, n_edges, seed))
+	algorithm.generate_input()
+	args = () if algorithm_type in WHOLE_GRAPH else (0,)
+
+	seconds = min(_timed(algorithm, args) for _ in range(repeats))
+	engine = getattr(algorithm._solver, 'engine', None)
+	peak = None
+	if memory:
+		# tracing slows every allocation several times over, so the peak comes from one extra solve
+		_reset(algorithm)
+		tracemalloc.start()
+		algorithm.solve(*args)
+		_, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+
+	return {
+		"algorithm": algorithm_type.name,
+		"input_type": input_type.name,
+		"engine": engine.name if engine is not None else None,
+		"nodes": n_nodes,
+		"edges": n_edges,
+		"seconds": seconds,
+		"peak_bytes": peak,
+		"edges_per_second": n_edges / seconds if seconds else float("inf"),
+	}
+
+
+def _reset(algorithm) -> None:
+	# re-setting the same graph drops anything a solver derived from it, e.g. all-pairs tables
+	algorithm._solver.set_graph(algorithm._solver.graph)
+
+
+def _timed(algorithm, args: tuple) -> float:
+	_reset(algorithm)
+	start = time.perf_counter()
+	algorithm.solve(*args)
+	return time.perf_counter() - start
+
+
+def run_suite(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, algorithms=None, input_types=None, repeats: int = 3, seed: int = 0, memory: bool = False) -> dict:
+	results = []
+	for algorithm_type in algorithms or list(AlgorithmType):
+		for input_type in input_types or list(InputType):
+			for n_nodes in sizes:
+				dense_only = input_type == InputType.ADJACENCY_MATRIX or algorithm_type == AlgorithmType.FLOYD_WARSHALL
+				if dense_only and n_nodes > MATRIX_LIMIT:
+					continue
+				for density in densities:
+					# density is the average out-degree, capped by what a simple graph can hold
+					n_edges = min(n_nodes * density, n_nodes * (n_nodes - 1) // 2)
+					results.append(run_case(algorithm_type, input_type, n_nodes, n_edges, repeats, seed, memory))
+	return {
+		"meta": {
+			"python": platform.python_version(),
+			"numpy": np.__version__,
+			"platform": platform.platform(),
+			"timestamp": time.time(),
+		},
+		"results": results,
+	}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+	fields = ("algorithm", "input_type", "engine", "nodes", "edges")
+
+	def key(entry):
+		# older baselines have no engine field; those runs used the solvers' default engines
+		return tuple(entry.get(field) for field in fields)
+
+	previous = {key(entry): entry for entry in baseline["results"]}
+	regressions = []
+	for entry in results["results"]:
+		old = previous.get(key(entry))
+		if old is None:
+			continue
+		for metric in ("seconds", "peak_bytes"):
+			if old.get(metric) and entry.get(metric) is not None and entry[metric] > old[metric] * (1 + tolerance):
+				regressions.append({**dict(zip(fields, key(entry))),
+					"metric": metric, "baseline": old[metric], "current": entry[metric]})
+	return regressions
+
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description="Scaling benchmarks per solver and input type")
+	parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+	parser.add_argument("--densities", type=int, nargs="+", default=DEFAULT_DENSITIES)
+	parser.add_argument("--algorithms", nargs="+", choices=[a.name for a in AlgorithmType])
+	parser.add_argument("--input-types", nargs="+", choices=[i.name for i in InputType])
+	parser.add_argument("--repeats", type=int, default=3)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--memory", action="store_true", help="also record peak memory with tracemalloc")
+	parser.add_argument("--output", default="bench_results.json")
+	parser.add_argument("--baseline")
+	parser.add_argument("--tolerance", type=float, default=0.25)
+	args = parser.parse_args(argv)
+
+	results = run_suite(
+		args.sizes,
+		args.densities,
+		[AlgorithmType[name] for name in args.algorithms] if args.algorithms else None,
+		[InputType[name] for name in args.input_types] if args.input_types else None,
+		args.repeats,
+		args.seed,
+		args.memory,
+	)
+	with open(args.output, "w") as f:
+		json.dump(results, f, indent=2)
+
+	for entry in results["results"]:
+		memory = f"{entry['peak_bytes'] / 1e6:>10.2f}MB" if entry['peak_bytes'] is not None else f"{'-':>12}"
+		print(f"{entry['algorithm']:<15}{entry['input_type']:<18}{entry['nodes']:>9}{entry['edges']:>10}"
+			f"{entry['seconds']:>12.5f}s{memory}{entry['edges_per_second']:>14.0f} e/s")
+
+	if args.baseline:
+		with open(args.baseline) as f:
+			regressions = compare(results, json.load(f), args.tolerance)
+		for regression in regressions:
+			print(f"REGRESSION {regression['algorithm']} {regression['input_type']} n={regression['nodes']} "
+				f"m={regression['edges']} {regression['metric']}: {regression['baseline']} -> {regression['current']}")
+		return 1 if regressions else 0
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,249 @@
+from array import array
+import heapq
+import math
+import mmap
+import struct
+from typing import Optional
+from input_factory import CSRGraph, InputType
+from solvers import adjacency
+
+# saved hierarchy layout: header, rank, then offsets/targets/weights/middle for the upward and downward graphs
+_CH_HEADER = struct.Struct('<8sqqqc7x')
+_CH_MAGIC = b'GACH\x00\x00\x00\x01'
+
+
+class ContractionHierarchy:
+	def __init__(self, rank, up: CSRGraph, up_middle, down: CSRGraph, down_middle):
+		# up holds edges u -> w with rank[w] > rank[u]; down holds, per node w, the edges u -> w with rank[u] > rank[w]
+		# middle is the contracted node a shortcut bypasses, or -1 for an original edge
+		self.rank = rank
+		self.up = up
+		self.up_middle = up_middle
+		self.down = down
+		self.down_middle = down_middle
+
+	@property
+	def n_nodes(self) -> int:
+		return len(self.rank)
+
+	@classmethod
+	def build(cls, graph, input_type: InputType, witness_limit: int = 64) -> "ContractionHierarchy":
+		if input_type not in (InputType.DICTIONARY, InputType.CSR):
+			raise ValueError("Contraction hierarchies are built from dictionary or CSR graphs")
+		nodes, neighbors = adjacency(graph, input_type)
+		n = max(nodes, default=-1) + 1
+		for node in nodes:
+			for _, to_node in neighbors(node):
+				n = max(n, to_node + 1)
+
+		# live graph as out[u][w] = inc[w][u] = (cost, middle), parallel edges collapsed to the cheapest
+		out = [{} for _ in range(n)]
+		inc = [{} for _ in range(n)]
+		for node in nodes:
+			for cost, to_node in neighbors(node):
+				if cost < 0:
+					raise ValueError("Contraction hierarchies need non-negative edge costs")
+				if to_node != node and cost < out[node].get(to_node, (math.inf,))[0]:
+					out[node][to_node] = inc[to_node][node] = (cost, -1)
+
+		rank = array('q', [-1]) * n
+		deleted = [0] * n
+		upward, downward = [None] * n, [None] * n
+		heap = [(cls._priority(out, inc, deleted, node, cls._shortcuts(out, inc, node, witness_limit)), node) for node in range(n)]
+		heapq.heapify(heap)
+
+		level = 0
+		while heap:
+			_, node = heapq.heappop(heap)
+			# lazy updates: re-check the popped node and put it back if a neighbour became cheaper
+			shortcuts = cls._shortcuts(out, inc, node, witness_limit)
+			priority = cls._priority(out, inc, deleted, node, shortcuts)
+			if heap and priority > heap[0][0]:
+				heapq.heappush(heap, (priority, node))
+				continue
+
+			for from_node, to_node, cost in shortcuts:
+				if cost < out[from_node].get(to_node, (math.inf,))[0]:
+					out[from_node][to_node] = inc[to_node][from_node] = (cost, node)
+
+			rank[node] = level
+			level += 1
+			upward[node] = [(to_node, cost, middle) for to_node, (cost, middle) in out[node].items()]
+			downward[node] = [(from_node, cost, middle) for from_node, (cost, middle) in inc[node].items()]
+			for to_node in out[node]:
+				del inc[to_node][node]
+				deleted[to_node] += 1
+			for from_node in inc[node]:
+				del out[from_node][node]
+				deleted[from_node] += 1
+			out[node], inc[node] = {}, {}
+
+		return cls(rank, *cls._pack(upward), *cls._pack(downward))
+
+	@staticmethod
+	def _pack(edges: list) -> tuple:
+		offsets, targets, middle = array('q', [0]), array('q'), array('q')
+		costs = [cost for items in edges for _, cost, _ in items]
+		weights = array('q' if all(isinstance(cost, int) for cost in costs) else 'd')
+		for items in edges:
+			for to_node, cost, via in items:
+				targets.append(to_node)
+				weights.append(cost)
+				middle.append(via)
+			offsets.append(len(targets))
+		return CSRGraph(offsets, targets, weights), middle
+
+	@staticmethod
+	def _priority(out: list, inc: list, deleted: list, node: int, shortcuts: list) -> int:
+		# edge difference plus contracted neighbours keeps the hierarchy shallow and evenly spread
+		return len(shortcuts) - len(out[node]) - len(inc[node]) + deleted[node]
+
+	@staticmethod
+	def _shortcuts(out: list, inc: list, node: int, witness_limit: int) -> list:
+		shortcuts = []
+		for from_node, (to_cost, _) in inc[node].items():
+			wanted = {to_node: to_cost + cost for to_node, (cost, _) in out[node].items() if to_node != from_node}
+			if not wanted:
+				continue
+			# bounded witness search: a path around node that is no longer makes the shortcut unnecessary
+			limit = max(wanted.values())
+			distances = {from_node: 0}
+			heap = [(0, from_node)]
+			settled, pending = 0, len(wanted)
+			while heap and settled < witness_limit and pending:
+				distance, current = heapq.heappop(heap)
+				if distance > distances[current]:
+					continue
+				if distance > limit:
+					break
+				settled += 1
+				if current in wanted:
+					pending -= 1
+				for to_node, (cost, _) in out[current].items():
+					if to_node != node and distance + cost < distances.get(to_node, math.inf):
+						distances[to_node] = distance + cost
+						heapq.heappush(heap, (distance + cost, to_node))
+			for to_node, cost in wanted.items():
+				if distances.get(to_node, math.inf) > cost:
+					shortcuts.append((from_node, to_node, cost))
+		return shortcuts
+
+	def _search(self, start: int, target: int) -> tuple:
+		# both searches only climb the hierarchy; the best meeting node joins them
+		graphs = ((self.up, self.up_middle), (self.down, self.down_middle))
+		distances = ({start: 0}, {target: 0})
+		parents = ({start: None}, {target: None})
+		heaps = ([(0, start)], [(0, target)])
+		best, meet = (0, start) if start == target else (math.inf, None)
+
+		while heaps[0] or heaps[1]:
+			side = 0 if heaps[0] and (not heaps[1] or heaps[0][0] <= heaps[1][0]) else 1
+			distance, node = heapq.heappop(heaps[side])
+			if distance >= best:
+				heaps[side].clear()
+				continue
+			mine, other = distances[side], distances[1 - side]
+			if distance > mine[node]:
+				continue
+			if node in other and distance + other[node] < best:
+				best, meet = distance + other[node], node
+
+			graph, middle = graphs[side]
+			offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+			for i in range(offsets[node], offsets[node+1]):
+				to_node = targets[i]
+				if distance + weights[i] < mine.get(to_node, math.inf):
+					mine[to_node] = distance + weights[i]
+					parents[side][to_node] = (node, middle[i])
+					heapq.heappush(heaps[side], (distance + weights[i], to_node))
+
+		return best, meet, parents
+
+	def _check(self, *nodes: int) -> None:
+		for node in nodes:
+			if not 0 <= node < self.n_nodes:
+				raise ValueError(f"Node {node} is not in the hierarchy")
+
+	def distance(self, start: int, target: int):
+		self._check(start, target)
+		return self._search(start, target)[0]
+
+	def path(self, start: int, target: int) -> Optional[list]:
+		return self.route(start, target)[1]
+
+	def route(self, start: int, target: int) -> tuple:
+		# (distance, path) from a single search; the path is None when target is unreachable
+		self._check(start, target)
+		best, meet, (forward, backward) = self._search(start, target)
+		if meet is None:
+			return best, None
+
+		hops = []
+		node = meet
+		while forward[node] is not None:
+			previous, middle = forward[node]
+			hops.append((previous, node, middle))
+			node = previous
+		hops.reverse()
+		node = meet
+		while backward[node] is not None:
+			following, middle = backward[node]
+			hops.append((node, following, middle))
+			node = following
+
+		path = [start]
+		for from_node, to_node, middle in hops:
+			path.extend(self._unpack(from_node, to_node, middle))
+		return best, path
+
+	def _unpack(self, from_node: int, to_node: int, middle: int) -> list:
+		# nodes after from_node on the original route of an edge, expanding shortcuts with an explicit stack
+		route, stack = [], [(from_node, to_node, middle)]
+		while stack:
+			from_node, to_node, middle = stack.pop()
+			if middle < 0:
+				route.append(to_node)
+				continue
+			stack.append((middle, to_node, self._middle(middle, to_node)))
+			stack.append((from_node, middle, self._middle(from_node, middle)))
+		return route
+
+	def _middle(self, from_node: int, to_node: int) -> int:
+		if self.rank[from_node] < self.rank[to_node]:
+			graph, middle, node, other = self.up, self.up_middle, from_node, to_node
+		else:
+			graph, middle, node, other = self.down, self.down_middle, to_node, from_node
+		for i in range(graph.offsets[node], graph.offsets[node+1]):
+			if graph.targets[i] == other:
+				return middle[i]
+		raise ValueError(f"Edge {from_node}->{to_node} is not in the hierarchy")
+
+	def save(self, path: str) -> None:
+		typecode = self.up.weights.typecode if hasattr(self.up.weights, 'typecode') else self.up.weights.format
+		with open(path, 'wb') as f:
+			f.write(_CH_HEADER.pack(_CH_MAGIC, self.n_nodes, self.up.n_edges, self.down.n_edges, typecode.encode()))
+			for buffer in (self.rank, *self._sections(self.up, self.up_middle), *self._sections(self.down, self.down_middle)):
+				f.write(memoryview(buffer).cast('B'))
+
+	@staticmethod
+	def _sections(graph: CSRGraph, middle) -> tuple:
+		return graph.offsets, graph.targets, graph.weights, middle
+
+	@classmethod
+	def load(cls, path: str) -> "ContractionHierarchy":
+		with open(path, 'rb') as f:
+			mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, n_nodes, n_up, n_down, typecode = _CH_HEADER.unpack_from(mapped)
+		if magic != _CH_MAGIC:
+			raise ValueError(f"{path} is not a saved contraction hierarchy")
+		view = memoryview(mapped)
+		start = _CH_HEADER.size
+		sections = []
+		layout = [('q', n_nodes)]
+		for n_edges in (n_up, n_down):
+			layout += [('q', n_nodes + 1), ('q', n_edges), (typecode.decode(), n_edges), ('q', n_edges)]
+		for code, length in layout:
+			sections.append(view[start:start + 8 * length].cast(code))
+			start += 8 * length
+		rank = sections[0]
+		return cls(rank, CSRGraph(*sections[1:4]), sections[4], CSRGraph(*sections[5:8]), sections[8])
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
 from ctypes import Union
-from typing import Optional
+from typing import Iterable, KeysView, Optional
 from typing_extensions import override
 import input_factory
 from input_factory import AbstractInputFactory, Input, InputFactoryProducer, InputType, AlgorithmType
+import parallel
 import solvers
-from solvers import DijkstraSolver, BellmanFordSolver, KruskalSolver, PrimsSolver
+from solvers import ShortestPaths, DijkstraSolver, BellmanFordSolver, KruskalSolver, PrimsSolver, BoruvkaSolver, FloydWarshallSolver, KahnsSolver, Engine
+from solvers import ComponentsSolver, StronglyConnectedSolver, BridgesSolver
+from utils import ResultCache, SolverStats
 
 
 class Algorithms(ABC):
@@ -18,6 +21,14 @@ class Algorithms(ABC):
 	@abstractmethod
 	def solve(self, start: int) -> list | dict | int:
 		pass
+	def set_input_factory(self, factory: AbstractInputFactory) -> None:
+		self._input_factory = factory
+
+	def solve_many(self, starts: Iterable[int], workers: Optional[int] = None) -> list:
+		return parallel.solve_many(self._solver, starts, workers)
+
+	def set_stats(self, stats: Optional[SolverStats]) -> None:
+		self._solver.set_stats(stats)
 	@abstractmethod
 	def draw_solution():
 		pass
@@ -36,6 +47,18 @@ class AlgorithmsFactory:
 				return Kruskal()
 			case AlgorithmType.PRIMS:
 				return Prims()
+			case AlgorithmType.FLOYD_WARSHALL:
+				return FloydWarshall()
+			case AlgorithmType.KAHNS:
+				return Kahns()
+			case AlgorithmType.BORUVKA:
+				return Boruvka()
+			case AlgorithmType.CONNECTED_COMPONENTS:
+				return ConnectedComponents()
+			case AlgorithmType.STRONGLY_CONNECTED_COMPONENTS:
+				return StronglyConnectedComponents()
+			case AlgorithmType.BRIDGES:
+				return Bridges()
 			case _:
 				raise ValueError("Invalid algorithm type")
 
@@ -52,15 +75,40 @@ class Dijkstra(Algorithms):
 		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
 		self._solver.set_input_type(self.input_type)
 
+	def set_engine(self, engine: Engine) -> None:
+		self._solver.set_engine(engine)
+
+	def set_cache(self, cache: Optional[ResultCache]) -> None:
+		self._solver.set_cache(cache)
+
 	def generate_input(self) -> None:
 		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
 		self.input = self._input_factory.get_input(AlgorithmType.DIJKSTRA)
 		self._solver.set_graph(self.input)
 
-	def solve(self, start: int) -> list | dict:
+	def set_heuristic(self, heuristic) -> None:
+		self._solver.set_heuristic(heuristic)
+
+	def set_hierarchy(self, hierarchy) -> None:
+		self._solver.set_hierarchy(hierarchy)
+
+	def set_delta(self, delta: Optional[float]) -> None:
+		self._solver.set_delta(delta)
+
+	def solve(self, start: int, targets: Optional[int | Iterable[int]] = None) -> list | dict:
+		# a single target switches to a point-to-point search: bidirectional, or A* with a heuristic
 		assert self.input is not None and isinstance(start, int)
-		return self._solver.solve(start)
-	
+		return self._solver.solve(start, targets)
+
+	def update_edge(self, from_node: int, to_node: int, cost) -> ShortestPaths:
+		return self._solver.update_edge(from_node, to_node, cost)
+
+	def insert_edge(self, from_node: int, to_node: int, cost) -> ShortestPaths:
+		return self._solver.insert_edge(from_node, to_node, cost)
+
+	def delete_edge(self, from_node: int, to_node: int) -> ShortestPaths:
+		return self._solver.delete_edge(from_node, to_node)
+
 	@staticmethod
 	def solve_custom_input(graph):
 		print("solving custom input")
@@ -82,6 +130,12 @@ class BellmanFord(Algorithms):
 		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
 		self._solver.set_input_type(self.input_type)
 
+	def set_engine(self, engine: Engine) -> None:
+		self._solver.set_engine(engine)
+
+	def set_cache(self, cache: Optional[ResultCache]) -> None:
+		self._solver.set_cache(cache)
+
 	def generate_input(self) -> None:
 		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
 		self.input = self._input_factory.get_input(AlgorithmType.BELLMAN_FORD)
@@ -90,7 +144,16 @@ class BellmanFord(Algorithms):
 	def solve(self, start: int) -> list | dict:
 		assert self.input is not None and isinstance(start, int)
 		return self._solver.solve(start)
-	
+
+	def update_edge(self, from_node: int, to_node: int, cost) -> ShortestPaths:
+		return self._solver.update_edge(from_node, to_node, cost)
+
+	def insert_edge(self, from_node: int, to_node: int, cost) -> ShortestPaths:
+		return self._solver.insert_edge(from_node, to_node, cost)
+
+	def delete_edge(self, from_node: int, to_node: int) -> ShortestPaths:
+		return self._solver.delete_edge(from_node, to_node)
+
 	@staticmethod
 	def solve_custom_input(graph):
 		print("solving custom input")
@@ -121,6 +184,18 @@ class Kruskal(Algorithms):
 		assert self.graph is not None and isinstance(start, int)
 		return self._solver.solve(start)
 
+	def solve_stream(self, edges: Iterable[tuple], n_nodes: int, presorted: bool = False) -> list:
+		return self._solver.solve_stream(edges, n_nodes, presorted)
+
+	def update_edge(self, from_node: int, to_node: int, cost) -> KeysView:
+		return self._solver.update_edge(from_node, to_node, cost)
+
+	def insert_edge(self, from_node: int, to_node: int, cost) -> KeysView:
+		return self._solver.insert_edge(from_node, to_node, cost)
+
+	def delete_edge(self, from_node: int, to_node: int) -> KeysView:
+		return self._solver.delete_edge(from_node, to_node)
+
 	@staticmethod
 	def solve_custom_input(graph):
 		print("solving custom input")
@@ -141,6 +216,9 @@ class Prims(Algorithms):
 		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
 		self._solver.set_input_type(self.input_type)
 
+	def set_engine(self, engine: Engine) -> None:
+		self._solver.set_engine(engine)
+
 	def generate_input(self) -> None:
 		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
 		self.graph = self._input_factory.get_input(AlgorithmType.PRIMS)
@@ -150,10 +228,223 @@ class Prims(Algorithms):
 		assert self.graph is not None and isinstance(start, int)
 		return self._solver.solve(start)
 
+	def update_edge(self, from_node: int, to_node: int, cost) -> KeysView:
+		return self._solver.update_edge(from_node, to_node, cost)
+
+	def insert_edge(self, from_node: int, to_node: int, cost) -> KeysView:
+		return self._solver.insert_edge(from_node, to_node, cost)
+
+	def delete_edge(self, from_node: int, to_node: int) -> KeysView:
+		return self._solver.delete_edge(from_node, to_node)
+
 	@staticmethod
 	def solve_custom_input(graph):
 		print("solving custom input")
 	
+	@staticmethod
+	def draw_solution(res):
+		pass
+
+class Boruvka(Algorithms):
+	def __init__(self):
+		self.input: Optional[list | dict] = None
+		self.input_type: Optional[InputType] = None
+		self._input_factory: Optional[AbstractInputFactory] = None
+		self._solver = BoruvkaSolver()
+
+	def set_input_type(self, input_type: InputType) -> None:
+		self.input_type = input_type
+		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
+		self._solver.set_input_type(self.input_type)
+
+	def generate_input(self) -> None:
+		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
+		self.input = self._input_factory.get_input(AlgorithmType.BORUVKA)
+		self._solver.set_graph(self.input)
+
+	def solve(self, start: int) -> list | dict:
+		assert self.input is not None and isinstance(start, int)
+		return self._solver.solve(start)
+
+	def update_edge(self, from_node: int, to_node: int, cost) -> KeysView:
+		return self._solver.update_edge(from_node, to_node, cost)
+
+	def insert_edge(self, from_node: int, to_node: int, cost) -> KeysView:
+		return self._solver.insert_edge(from_node, to_node, cost)
+
+	def delete_edge(self, from_node: int, to_node: int) -> KeysView:
+		return self._solver.delete_edge(from_node, to_node)
+
+	@staticmethod
+	def solve_custom_input(graph):
+		print("solving custom input")
+
+	@staticmethod
+	def draw_solution(res):
+		pass
+
+class FloydWarshall(Algorithms):
+	def __init__(self):
+		self.input: Optional[list | dict] = None
+		self.input_type: Optional[InputType] = None
+		self._input_factory: Optional[AbstractInputFactory] = None
+		self._solver = FloydWarshallSolver()
+
+	def set_input_type(self, input_type: InputType) -> None:
+		self.input_type = input_type
+		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
+		self._solver.set_input_type(self.input_type)
+
+	def set_engine(self, engine: Engine) -> None:
+		self._solver.set_engine(engine)
+
+	def set_predecessors(self, track: bool) -> None:
+		self._solver.set_predecessors(track)
+
+	def generate_input(self) -> None:
+		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
+		self.input = self._input_factory.get_input(AlgorithmType.FLOYD_WARSHALL)
+		self._solver.set_graph(self.input)
+
+	def solve(self, start: int) -> list | dict:
+		assert self.input is not None and isinstance(start, int)
+		return self._solver.solve(start)
+
+	def solve_all(self):
+		assert self.input is not None
+		return self._solver.solve_all()
+
+	def path(self, start: int, end: int) -> list:
+		return self._solver.path(start, end)
+
+	@staticmethod
+	def solve_custom_input(graph):
+		print("solving custom input")
+
+	@staticmethod
+	def draw_solution(res):
+		pass
+
+class Kahns(Algorithms):
+	def __init__(self):
+		self.input: Optional[list | dict] = None
+		self.input_type: Optional[InputType] = None
+		self._input_factory: Optional[AbstractInputFactory] = None
+		self._solver = KahnsSolver()
+
+	def set_input_type(self, input_type: InputType) -> None:
+		self.input_type = input_type
+		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
+		self._solver.set_input_type(self.input_type)
+
+	def generate_input(self) -> None:
+		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
+		self.input = self._input_factory.get_input(AlgorithmType.KAHNS)
+		self._solver.set_graph(self.input)
+
+	def sort(self) -> list:
+		assert self.input is not None
+		return self._solver.sort()
+
+	def solve(self, start: int, longest: bool = False) -> list | dict:
+		assert self.input is not None and isinstance(start, int)
+		return self._solver.solve(start, longest)
+
+	@staticmethod
+	def solve_custom_input(graph):
+		print("solving custom input")
+
+	@staticmethod
+	def draw_solution(res):
+		pass
+
+class ConnectedComponents(Algorithms):
+	def __init__(self):
+		self.input: Optional[list | dict] = None
+		self.input_type: Optional[InputType] = None
+		self._input_factory: Optional[AbstractInputFactory] = None
+		self._solver = ComponentsSolver()
+
+	def set_input_type(self, input_type: InputType) -> None:
+		self.input_type = input_type
+		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
+		self._solver.set_input_type(self.input_type)
+
+	def generate_input(self) -> None:
+		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
+		self.input = self._input_factory.get_input(AlgorithmType.CONNECTED_COMPONENTS)
+		self._solver.set_graph(self.input)
+
+	def solve(self, start: Optional[int] = None) -> list:
+		assert self.input is not None
+		return self._solver.solve(start)
+
+	@staticmethod
+	def solve_custom_input(graph):
+		print("solving custom input")
+
+	@staticmethod
+	def draw_solution(res):
+		pass
+
+class StronglyConnectedComponents(Algorithms):
+	def __init__(self):
+		self.input: Optional[list | dict] = None
+		self.input_type: Optional[InputType] = None
+		self._input_factory: Optional[AbstractInputFactory] = None
+		self._solver = StronglyConnectedSolver()
+
+	def set_input_type(self, input_type: InputType) -> None:
+		self.input_type = input_type
+		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
+		self._solver.set_input_type(self.input_type)
+
+	def generate_input(self) -> None:
+		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
+		self.input = self._input_factory.get_input(AlgorithmType.STRONGLY_CONNECTED_COMPONENTS)
+		self._solver.set_graph(self.input)
+
+	def solve(self, start: Optional[int] = None) -> list:
+		assert self.input is not None
+		return self._solver.solve(start)
+
+	@staticmethod
+	def solve_custom_input(graph):
+		print("solving custom input")
+
+	@staticmethod
+	def draw_solution(res):
+		pass
+
+class Bridges(Algorithms):
+	def __init__(self):
+		self.input: Optional[list | dict] = None
+		self.input_type: Optional[InputType] = None
+		self._input_factory: Optional[AbstractInputFactory] = None
+		self._solver = BridgesSolver()
+
+	def set_input_type(self, input_type: InputType) -> None:
+		self.input_type = input_type
+		self._input_factory = InputFactoryProducer.get_factory(self.input_type)
+		self._solver.set_input_type(self.input_type)
+
+	def generate_input(self) -> None:
+		assert isinstance(self.input_type, InputType) and isinstance(self._input_factory, AbstractInputFactory)
+		self.input = self._input_factory.get_input(AlgorithmType.BRIDGES)
+		self._solver.set_graph(self.input)
+
+	def solve(self, start: Optional[int] = None) -> list:
+		assert self.input is not None
+		return self._solver.solve(start)
+
+	def articulation_points(self) -> list:
+		assert self.input is not None
+		return self._solver.articulation_points()
+
+	@staticmethod
+	def solve_custom_input(graph):
+		print("solving custom input")
+
 	@staticmethod
 	def draw_solution(res):
 		pass
\ No newline at end of file
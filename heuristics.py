@@ -0,0 +1,59 @@
+import math
+from typing import Iterable, Optional
+from input_factory import InputType
+from solvers import DijkstraSolver, adjacency, reverse_adjacency
+
+
+class CoordinateHeuristic:
+	# straight-line distance between node positions; scale must not exceed the lowest cost per unit of distance
+	def __init__(self, coordinates, scale: float = 1.0):
+		self.coordinates = coordinates
+		self.scale = scale
+
+	def __call__(self, node: int, target: int) -> float:
+		return math.dist(self.coordinates[node], self.coordinates[target]) * self.scale
+
+
+class LandmarkHeuristic:
+	# ALT bounds from the triangle inequality over distances to and from a few landmarks
+	def __init__(self, graph, input_type: InputType, landmarks: Optional[Iterable[int]] = None, count: int = 4):
+		forward = DijkstraSolver()
+		forward.set_input_type(input_type)
+		forward.set_graph(graph)
+		backward = DijkstraSolver()
+		backward.set_input_type(InputType.DICTIONARY)
+		backward.set_graph(reverse_adjacency(graph, input_type))
+
+		if landmarks is None:
+			landmarks = self._pick(forward, count)
+		self.landmarks = list(landmarks)
+		self.from_landmark = [forward.solve(landmark) for landmark in self.landmarks]
+		self.to_landmark = [backward.solve(landmark) for landmark in self.landmarks]
+
+	@staticmethod
+	def _pick(solver: DijkstraSolver, count: int) -> list:
+		# farthest-first: each new landmark is the reachable node furthest from the ones chosen so far
+		nodes, _ = adjacency(solver.graph, solver.input_type)
+		first = solver.solve(next(iter(nodes)))
+		nearest = {node: distance for node, distance in first.items() if distance != math.inf}
+		landmarks = []
+		while len(landmarks) < count and nearest:
+			landmark = max(nearest, key=nearest.get)
+			landmarks.append(landmark)
+			for node, distance in solver.solve(landmark).items():
+				if node in nearest:
+					nearest[node] = min(nearest[node], distance)
+			nearest.pop(landmark)
+		return landmarks
+
+	def __call__(self, node: int, target: int) -> float:
+		bound = 0
+		for from_landmark, to_landmark in zip(self.from_landmark, self.to_landmark):
+			# d(L, t) - d(L, v) and d(v, L) - d(t, L) both underestimate d(v, t)
+			lt, lv = from_landmark.get(target, math.inf), from_landmark.get(node, math.inf)
+			if lt != math.inf and lv != math.inf:
+				bound = max(bound, lt - lv)
+			vl, tl = to_landmark.get(node, math.inf), to_landmark.get(target, math.inf)
+			if vl != math.inf and tl != math.inf:
+				bound = max(bound, vl - tl)
+		return bound
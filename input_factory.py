@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from array import array
 from enum import Enum, auto
+from itertools import islice
 import math
-from typing import Literal, Optional, Type
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Literal, Optional, Type
+import numpy as np
 
 class AlgorithmType(Enum):
 	BELLMAN_FORD = auto()
@@ -10,10 +16,150 @@ class AlgorithmType(Enum):
 	PRIMS = auto()
 	KAHNS = auto()
 	FLOYD_WARSHALL = auto()
+	BORUVKA = auto()
+	CONNECTED_COMPONENTS = auto()
+	STRONGLY_CONNECTED_COMPONENTS = auto()
+	BRIDGES = auto()
+
+class CSRGraph:
+	def __init__(self, offsets: array, targets: array, weights: array):
+		assert len(offsets) >= 1 and len(targets) == len(weights)
+		self.offsets = offsets
+		self.targets = targets
+		self.weights = weights
+
+	def __len__(self) -> int:
+		return len(self.offsets) - 1
+
+	@property
+	def n_nodes(self) -> int:
+		return len(self.offsets) - 1
+
+	@property
+	def n_edges(self) -> int:
+		return len(self.targets)
+
+	def neighbors(self, node: int) -> Iterable[tuple]:
+		lo, hi = self.offsets[node], self.offsets[node+1]
+		return zip(self.weights[lo:hi], self.targets[lo:hi])
+
+	def edges(self) -> Iterable[tuple]:
+		offsets, targets, weights = self.offsets, self.targets, self.weights
+		for node in range(len(offsets) - 1):
+			for i in range(offsets[node], offsets[node+1]):
+				yield weights[i], node, targets[i]
+
+	@classmethod
+	def from_edges(cls, n_nodes: int, edges: Iterable[tuple]) -> "CSRGraph":
+		# edges are (cost, from, to); kept in flat arrays and counting-sorted by source
+		src, dst, wt = array('q'), array('q'), array('q')
+		for cost, from_node, to_node in edges:
+			src.append(from_node)
+			dst.append(to_node)
+			try:
+				wt.append(cost)
+			except TypeError:
+				wt = array('d', wt)
+				wt.append(cost)
+
+		offsets = array('q', bytes(8 * (n_nodes + 1)))
+		for node in src:
+			offsets[node+1] += 1
+		for node in range(n_nodes):
+			offsets[node+1] += offsets[node]
+
+		fill = array('q', offsets)
+		targets = array('q', bytes(8 * len(dst)))
+		weights = array(wt.typecode, bytes(wt.itemsize * len(wt)))
+		for i in range(len(src)):
+			pos = fill[src[i]]
+			targets[pos] = dst[i]
+			weights[pos] = wt[i]
+			fill[src[i]] = pos + 1
+
+		return cls(offsets, targets, weights)
+
+	@classmethod
+	def from_arrays(cls, n_nodes: int, sources, targets, weights) -> "CSRGraph":
+		# vectorised counting sort for large edge sets; the stable sort keeps per-node edge order
+		sources = np.asarray(sources, dtype=np.int64)
+		order = np.argsort(sources, kind='stable')
+		offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+		np.cumsum(np.bincount(sources, minlength=n_nodes), out=offsets[1:])
+		weights = np.asarray(weights)[order]
+		typecode = 'q' if weights.dtype.kind in 'iu' else 'd'
+		return cls(
+			array('q', offsets.tobytes()),
+			array('q', np.asarray(targets, dtype=np.int64)[order].tobytes()),
+			array(typecode, weights.astype(np.int64 if typecode == 'q' else np.float64).tobytes()),
+		)
+
+	@classmethod
+	def from_dict(cls, graph: dict) -> "CSRGraph":
+		n_nodes = 0
+		for node, items in graph.items():
+			n_nodes = max(n_nodes, node + 1)
+			for item in items:
+				n_nodes = max(n_nodes, item[1] + 1)
+		return cls.from_edges(n_nodes, ((item[0], node, item[1]) for node, items in graph.items() for item in items))
+
+	@classmethod
+	def from_matrix(cls, graph: list) -> "CSRGraph":
+		return cls.from_edges(len(graph), (
+			(cost, node, to_node)
+			for node, row in enumerate(graph)
+			for to_node, cost in enumerate(row)
+			if cost != 0 and cost != math.inf
+		))
+
+	def to_dict(self) -> dict:
+		return {node: list(self.neighbors(node)) for node in range(self.n_nodes)}
+
+# saved CSR layout: header, then offsets, targets and weights as raw 8-byte little-endian sections
+_CSR_HEADER = struct.Struct('<8sqqc7x')
+_CSR_MAGIC = b'GACSR\x00\x00\x01'
+# saved matrix layout: header, then n*n float64 costs in row order
+_MATRIX_HEADER = struct.Struct('<8sq16x')
+_MATRIX_MAGIC = b'GAMAT\x00\x00\x01'
+
+def save_csr(path: str, graph: CSRGraph) -> None:
+	typecode = graph.weights.typecode if hasattr(graph.weights, 'typecode') else graph.weights.format
+	with open(path, 'wb') as f:
+		f.write(_CSR_HEADER.pack(_CSR_MAGIC, graph.n_nodes, graph.n_edges, typecode.encode()))
+		for buffer in (graph.offsets, graph.targets, graph.weights):
+			f.write(memoryview(buffer).cast('B'))
+
+def load_csr(path: str) -> CSRGraph:
+	with open(path, 'rb') as f:
+		mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+	magic, n_nodes, n_edges, typecode = _CSR_HEADER.unpack_from(mapped)
+	if magic != _CSR_MAGIC:
+		raise ValueError(f"{path} is not a saved CSR graph")
+	view = memoryview(mapped)
+	start = _CSR_HEADER.size
+	sections = []
+	for code, length in (('q', n_nodes + 1), ('q', n_edges), (typecode.decode(), n_edges)):
+		sections.append(view[start:start + 8 * length].cast(code))
+		start += 8 * length
+	return CSRGraph(*sections)
+
+def save_matrix(path: str, graph) -> None:
+	matrix = np.asarray(graph, dtype=np.float64)
+	with open(path, 'wb') as f:
+		f.write(_MATRIX_HEADER.pack(_MATRIX_MAGIC, len(matrix)))
+		f.write(np.ascontiguousarray(matrix).tobytes())
+
+def load_matrix(path: str) -> np.ndarray:
+	with open(path, 'rb') as f:
+		magic, n = _MATRIX_HEADER.unpack(f.read(_MATRIX_HEADER.size))
+	if magic != _MATRIX_MAGIC:
+		raise ValueError(f"{path} is not a saved matrix")
+	return np.memmap(path, dtype=np.float64, mode='r', offset=_MATRIX_HEADER.size, shape=(n, n))
 
 class InputType(Enum):
 	DICTIONARY = dict
 	ADJACENCY_MATRIX = list
+	CSR = CSRGraph
 
 class Input(ABC):
 	@abstractmethod
@@ -126,6 +272,175 @@ class PrimsInput(Input):
 			case _:
 				raise ValueError("Invalid input type")
 
+class FloydWarshallInput(Input):
+	def __init__(self, input_type):
+		self.input_type = input_type
+	def generate(self) -> list | dict:
+		# negative edges without a negative cycle, so Johnson's reweighting is exercised too
+		return BellmanFordInput(self.input_type).generate()
+
+class KahnsInput(Input):
+	def __init__(self, input_type):
+		self.input_type = input_type
+	def generate(self) -> list | dict:
+		match self.input_type:
+			case InputType.DICTIONARY:
+				return {
+					0:[(5, 1), (3, 2)],
+					1:[(6, 3), (2, 2)],
+					2:[(4, 4), (2, 5), (7, 3)],
+					3:[(-1, 4), (1, 5)],
+					4:[(-2, 5)],
+					5:[]
+				}
+			case InputType.ADJACENCY_MATRIX:
+				return [
+					[0, 5, 3, 0, 0, 0],
+					[0, 0, 2, 6, 0, 0],
+					[0, 0, 0, 7, 4, 2],
+					[0, 0, 0, 0, -1, 1],
+					[0, 0, 0, 0, 0, -2],
+					[0, 0, 0, 0, 0, 0]
+				]
+			case _:
+				raise ValueError("Invalid input type")
+
+def csr_to_dict(graph: CSRGraph, undirected: bool = False) -> dict:
+	# undirected graphs use the (cost, to, from) entries of the MST fixtures
+	if not undirected:
+		return graph.to_dict()
+	return {node: [(cost, to_node, node) for cost, to_node in graph.neighbors(node)] for node in range(graph.n_nodes)}
+
+def edges_to_input(input_type: InputType, n_nodes: int, sources, targets, weights, undirected: bool = False) -> list | dict | CSRGraph:
+	sources, targets, weights = np.asarray(sources), np.asarray(targets), np.asarray(weights)
+	if undirected:
+		sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+		weights = np.concatenate([weights, weights])
+
+	match input_type:
+		case InputType.CSR:
+			return CSRGraph.from_arrays(n_nodes, sources, targets, weights)
+		case InputType.DICTIONARY:
+			return csr_to_dict(CSRGraph.from_arrays(n_nodes, sources, targets, weights), undirected)
+		case InputType.ADJACENCY_MATRIX:
+			# MST fixtures mark missing edges with inf and a zero diagonal, shortest-path ones with 0
+			missing = math.inf if undirected else 0
+			matrix = [[missing] * n_nodes for _ in range(n_nodes)]
+			for node in range(n_nodes) if undirected else ():
+				matrix[node][node] = 0
+			for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+				matrix[source][target] = weight
+			return matrix
+		case _:
+			raise ValueError("Invalid input type")
+
+class RandomGraphInput(Input):
+	def __init__(self, input_type, n_nodes: int, n_edges: int, seed: Optional[int] = None,
+			undirected: bool = False, min_weight: int = 1, max_weight: int = 100):
+		self.input_type = input_type
+		self.n_nodes = n_nodes
+		self.n_edges = n_edges
+		self.undirected = undirected
+		self.min_weight = min_weight
+		self.max_weight = max_weight
+		self.rng = np.random.default_rng(seed)
+
+	@abstractmethod
+	def edges(self) -> tuple:
+		pass
+
+	def generate(self) -> list | dict | CSRGraph:
+		sources, targets = self.edges()
+		weights = self.rng.integers(self.min_weight, self.max_weight + 1, size=len(sources))
+		return edges_to_input(self.input_type, self.n_nodes, sources, targets, weights, self.undirected)
+
+	def _distinct_pairs(self, n_edges: int, ordered: bool) -> tuple:
+		# rejection sampling in bulk: draw batches of pairs, drop loops and repeats until enough remain
+		n = self.n_nodes
+		capacity = n * (n - 1) // (1 if ordered and not self.undirected else 2)
+		if n_edges > capacity:
+			raise ValueError(f"{n_edges} edges do not fit in a simple graph on {n} nodes")
+		keys = np.zeros(0, dtype=np.int64)
+		while len(keys) < n_edges:
+			batch = int((n_edges - len(keys)) * 1.2) + 16
+			u = self.rng.integers(0, n, size=batch)
+			v = self.rng.integers(0, n, size=batch)
+			keep = u != v
+			u, v = u[keep], v[keep]
+			if self.undirected or not ordered:
+				u, v = np.minimum(u, v), np.maximum(u, v)
+			keys = np.unique(np.concatenate([keys, u * n + v]))
+		keys = self.rng.permutation(keys)[:n_edges]
+		return keys // n, keys % n
+
+class ErdosRenyiInput(RandomGraphInput):
+	def edges(self) -> tuple:
+		return self._distinct_pairs(self.n_edges, ordered=True)
+
+class DagInput(RandomGraphInput):
+	def __init__(self, input_type, n_nodes: int, n_edges: int, seed: Optional[int] = None, min_weight: int = 1, max_weight: int = 100):
+		super().__init__(input_type, n_nodes, n_edges, seed, False, min_weight, max_weight)
+
+	def edges(self) -> tuple:
+		# pairs are drawn as low -> high in a random topological order
+		low, high = self._distinct_pairs(self.n_edges, ordered=False)
+		order = self.rng.permutation(self.n_nodes)
+		return order[low], order[high]
+
+class BarabasiAlbertInput(RandomGraphInput):
+	def edges(self) -> tuple:
+		n = self.n_nodes
+		per_node = max(1, self.n_edges // max(1, n - 1))
+		total = per_node * (n - 1)
+		sources = np.arange(total) // per_node + 1
+
+		# endpoint slot 2k is edge k's source and 2k+1 its target; each target copies a uniformly
+		# chosen earlier slot, which is preferential attachment, and chains of copies are resolved in bulk
+		earlier = 2 * per_node * (sources - 1)
+		slots = np.floor(self.rng.random(total) * earlier).astype(np.int64)
+		slots[earlier == 0] = -1
+		while True:
+			pending = (slots >= 0) & (slots % 2 == 1)
+			if not pending.any():
+				break
+			slots[pending] = slots[slots[pending] // 2]
+		targets = np.where(slots < 0, 0, sources[np.maximum(slots, 0) // 2])
+		if self.undirected:
+			sources, targets = np.minimum(sources, targets), np.maximum(sources, targets)
+		keys = np.unique(sources * n + targets)
+		return keys // n, keys % n
+
+class GridInput(RandomGraphInput):
+	def coordinates(self) -> np.ndarray:
+		# (row, col) of every node on the lattice, for distance heuristics
+		cols = max(1, int(math.ceil(math.sqrt(self.n_nodes))))
+		node = np.arange(self.n_nodes)
+		return np.stack([node // cols, node % cols], axis=1)
+
+	def edges(self) -> tuple:
+		# a near-square lattice with right/down streets, thinned or densified with diagonals to n_edges
+		n = self.n_nodes
+		cols = max(1, int(math.ceil(math.sqrt(n))))
+		node = np.arange(n)
+		right = node[(node % cols != cols - 1) & (node + 1 < n)]
+		down = node[node + cols < n]
+		diagonal = node[(node % cols != cols - 1) & (node + cols + 1 < n)]
+		sources = np.concatenate([right, down, diagonal])
+		targets = np.concatenate([right + 1, down + cols, diagonal + cols + 1])
+		streets = len(right) + len(down)
+		# streets run both ways on a directed road network, so each one accounts for two edges
+		wanted = self.n_edges if self.undirected else self.n_edges // 2
+
+		if wanted <= streets:
+			pick = self.rng.choice(streets, size=wanted, replace=False)
+		else:
+			extra = self.rng.choice(len(diagonal), size=min(wanted - streets, len(diagonal)), replace=False)
+			pick = np.concatenate([np.arange(streets), streets + extra])
+		sources, targets = sources[pick], targets[pick]
+		if not self.undirected:
+			sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+		return sources, targets
+
 class AbstractInputFactory(ABC):
 	@abstractmethod
 	def get_input(self, for_algorithm: AlgorithmType) -> list | dict:
@@ -139,6 +454,8 @@ class InputFactoryProducer:
 				return DictionaryInputFactory()
 			case InputType.ADJACENCY_MATRIX:
 				return AdjacencyMatrixInputFactory()
+			case InputType.CSR:
+				return CSRInputFactory()
 			case _:
 				raise ValueError('Invalid input type')
 
@@ -148,12 +465,16 @@ class DictionaryInputFactory(AbstractInputFactory):
 		match for_algorithm:
 			case AlgorithmType.DIJKSTRA:
 				return DijkstraInput(InputType.DICTIONARY).generate()
-			case AlgorithmType.BELLMAN_FORD:
+			case AlgorithmType.BELLMAN_FORD | AlgorithmType.STRONGLY_CONNECTED_COMPONENTS:
 				return BellmanFordInput(InputType.DICTIONARY).generate()
-			case AlgorithmType.KRUSKAL:
+			case AlgorithmType.KRUSKAL | AlgorithmType.BORUVKA | AlgorithmType.CONNECTED_COMPONENTS | AlgorithmType.BRIDGES:
 				return KruskalInput(InputType.DICTIONARY).generate()
 			case AlgorithmType.PRIMS:
 				return PrimsInput(InputType.DICTIONARY).generate()
+			case AlgorithmType.FLOYD_WARSHALL:
+				return FloydWarshallInput(InputType.DICTIONARY).generate()
+			case AlgorithmType.KAHNS:
+				return KahnsInput(InputType.DICTIONARY).generate()
 			case _:
 				raise ValueError("Algorithm not supported")
 
@@ -163,13 +484,96 @@ class AdjacencyMatrixInputFactory(AbstractInputFactory):
 		match for_algorithm:
 			case AlgorithmType.DIJKSTRA:
 				return DijkstraInput(InputType.ADJACENCY_MATRIX).generate()
-			case AlgorithmType.BELLMAN_FORD:
+			case AlgorithmType.BELLMAN_FORD | AlgorithmType.STRONGLY_CONNECTED_COMPONENTS:
 				return BellmanFordInput(InputType.ADJACENCY_MATRIX).generate()
-			case AlgorithmType.KRUSKAL:
+			case AlgorithmType.KRUSKAL | AlgorithmType.BORUVKA | AlgorithmType.CONNECTED_COMPONENTS | AlgorithmType.BRIDGES:
 				return KruskalInput(InputType.ADJACENCY_MATRIX).generate()
 			case AlgorithmType.PRIMS:
 				return PrimsInput(InputType.ADJACENCY_MATRIX).generate()
+			case AlgorithmType.FLOYD_WARSHALL:
+				return FloydWarshallInput(InputType.ADJACENCY_MATRIX).generate()
+			case AlgorithmType.KAHNS:
+				return KahnsInput(InputType.ADJACENCY_MATRIX).generate()
 			case _:
 				raise ValueError("Algorithm not supported")
 
+class CSRInputFactory(AbstractInputFactory):
+	@staticmethod
+	def get_input(for_algorithm: AlgorithmType) -> CSRGraph:
+		return CSRGraph.from_dict(DictionaryInputFactory.get_input(for_algorithm))
+
+class FileInputFactory(AbstractInputFactory):
+	EDGE_RECORD = np.dtype([('source', '<i8'), ('target', '<i8'), ('weight', '<f8')])
+
+	def __init__(self, path: str, input_type: InputType = InputType.CSR, chunk_size: int = 1_000_000):
+		self.path = path
+		self.input_type = input_type
+		self.chunk_size = chunk_size
+
+	def get_input(self, for_algorithm: AlgorithmType) -> list | dict | CSRGraph:
+		undirected = for_algorithm in (AlgorithmType.KRUSKAL, AlgorithmType.PRIMS, AlgorithmType.BORUVKA,
+			AlgorithmType.CONNECTED_COMPONENTS, AlgorithmType.BRIDGES)
+		match os.path.splitext(self.path)[1].lower():
+			case '.csr':
+				graph = load_csr(self.path)
+				match self.input_type:
+					case InputType.CSR:
+						return graph
+					case InputType.DICTIONARY:
+						return csr_to_dict(graph, undirected)
+				raise ValueError("Saved CSR graphs load as CSR or DICTIONARY inputs")
+			case '.mat':
+				if self.input_type != InputType.ADJACENCY_MATRIX:
+					raise ValueError("Saved matrices load as ADJACENCY_MATRIX inputs")
+				return load_matrix(self.path)
+
+		sources, targets, weights = [], [], []
+		for chunk_sources, chunk_targets, chunk_weights in self.iter_chunks():
+			sources.append(chunk_sources)
+			targets.append(chunk_targets)
+			weights.append(chunk_weights)
+		sources = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64)
+		targets = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int64)
+		weights = np.concatenate(weights) if weights else np.zeros(0)
+		if len(weights) and np.array_equal(weights, np.round(weights)):
+			weights = weights.astype(np.int64)
+		n_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+		return edges_to_input(self.input_type, n_nodes, sources, targets, weights, undirected)
+
+	def iter_chunks(self) -> Iterator[tuple]:
+		match os.path.splitext(self.path)[1].lower():
+			case '.csv':
+				yield from self._read_text(',')
+			case '.tsv':
+				yield from self._read_text('\t')
+			case '.bin':
+				records = np.memmap(self.path, dtype=self.EDGE_RECORD, mode='r')
+				for start in range(0, len(records), self.chunk_size):
+					chunk = records[start:start + self.chunk_size]
+					yield np.array(chunk['source']), np.array(chunk['target']), np.array(chunk['weight'])
+			case _:
+				raise ValueError(f"Unsupported edge list format: {self.path}")
+
+	def iter_edges(self) -> Iterator[tuple]:
+		for sources, targets, weights in self.iter_chunks():
+			if np.array_equal(weights, np.round(weights)):
+				weights = weights.astype(np.int64)
+			yield from zip(weights.tolist(), sources.tolist(), targets.tolist())
+
+	def _read_text(self, delimiter: str) -> Iterator[tuple]:
+		with open(self.path) as f:
+			first = True
+			while True:
+				lines = list(islice(f, self.chunk_size))
+				if not lines:
+					return
+				lines = [line for line in lines if line.strip() and not line.lstrip().startswith('#')]
+				if first and lines and not lines[0].split(delimiter)[0].strip().lstrip('-').isdigit():
+					lines = lines[1:]
+				first = False
+				if not lines:
+					continue
+				block = np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+				yield block[:, 0].astype(np.int64), block[:, 1].astype(np.int64), block[:, 2]
+
 #####
\ No newline at end of file
@@ -0,0 +1,136 @@
+from multiprocessing import shared_memory
+import multiprocessing
+import os
+from typing import Iterable, Optional
+import numpy as np
+from input_factory import CSRGraph, InputType
+from solvers import ShortestPaths
+from utils import SolverStats
+
+# solver settings handed to every worker, each applied through the matching set_<name>
+_OPTIONS = ('engine', 'delta', 'heuristic', 'hierarchy')
+
+_worker_solver = None
+_worker_segments = None
+_worker_stats = False
+
+
+def to_csr(graph, input_type: InputType) -> CSRGraph:
+	match input_type:
+		case InputType.DICTIONARY:
+			return CSRGraph.from_dict(graph)
+		case InputType.ADJACENCY_MATRIX:
+			return CSRGraph.from_matrix(graph)
+		case InputType.CSR:
+			return graph
+		case _:
+			raise ValueError("Invalid input type")
+
+
+def share_graph(graph, segments: list) -> list:
+	# one shared segment per CSR buffer, or one for a whole matrix; workers attach by name instead of unpickling the graph
+	# segments are appended as they are created so the caller can release them if a later one fails
+	if isinstance(graph, np.ndarray):
+		matrix = np.ascontiguousarray(graph)
+		segment = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+		segments.append(segment)
+		np.ndarray(matrix.shape, matrix.dtype, buffer=segment.buf)[...] = matrix
+		return [(segment.name, matrix.dtype.str, matrix.shape)]
+	spec = []
+	for buffer in (graph.offsets, graph.targets, graph.weights):
+		raw = memoryview(buffer).cast('B')
+		segment = shared_memory.SharedMemory(create=True, size=max(raw.nbytes, 1))
+		segments.append(segment)
+		segment.buf[:raw.nbytes] = raw
+		# arrays carry a typecode, while sections mapped from a file are memoryviews with a format
+		spec.append((segment.name, getattr(buffer, 'typecode', None) or buffer.format, len(buffer)))
+	return spec
+
+
+def attach_graph(spec: list) -> tuple:
+	segments, buffers = [], []
+	for name, typecode, length in spec:
+		segment = shared_memory.SharedMemory(name=name)
+		segments.append(segment)
+		if isinstance(length, tuple):
+			matrix = np.ndarray(length, np.dtype(typecode), buffer=segment.buf)
+			matrix.flags.writeable = False
+			return segments, matrix
+		buffers.append(segment.buf.cast(typecode)[:length])
+	return segments, CSRGraph(*buffers)
+
+
+def _init_worker(spec: list, input_type: InputType, solver_type: type, options: dict, stats: bool) -> None:
+	global _worker_solver, _worker_segments, _worker_stats
+	_worker_segments, graph = attach_graph(spec)
+	_worker_solver = solver_type()
+	_worker_solver.set_input_type(input_type)
+	_worker_solver.set_graph(graph)
+	# after set_graph, which drops graph-derived settings such as a hierarchy
+	for name, value in options.items():
+		getattr(_worker_solver, f'set_{name}')(value)
+	_worker_stats = stats
+
+
+def _solve(start: int) -> tuple:
+	if not _worker_stats:
+		return _worker_solver.solve(start), None
+	stats = SolverStats()
+	_worker_solver.set_stats(stats)
+	return _worker_solver.solve(start), stats
+
+
+def solve_many(solver, starts: Iterable[int], workers: Optional[int] = None) -> list:
+	starts = list(starts)
+	workers = workers or os.cpu_count() or 1
+	# matrices are shared as they are so the dense engines keep working; everything else goes over as CSR
+	input_type = InputType.ADJACENCY_MATRIX if solver.input_type == InputType.ADJACENCY_MATRIX else InputType.CSR
+	engine = getattr(solver, 'engine', None)
+	supported = type(solver)._engines.get(engine)
+	# an engine that cannot run on the shared layout would quietly fall back to a slower one in the workers
+	if workers <= 1 or len(starts) <= 1 or (supported is not None and input_type not in supported):
+		return [solver.solve(start) for start in starts]
+
+	results = {}
+	if solver.cache is not None:
+		for start in dict.fromkeys(starts):
+			hit = solver.cache.get(solver._cache_key(start))
+			if hit is not None:
+				solver._count('cache_hits')
+				results[start] = hit
+	pending = [start for start in dict.fromkeys(starts) if start not in results]
+
+	if pending:
+		options = {name: getattr(solver, name) for name in _OPTIONS if getattr(solver, name, None) is not None}
+		graph = np.asarray(solver.graph) if input_type == InputType.ADJACENCY_MATRIX else to_csr(solver.graph, solver.input_type)
+		segments = []
+		try:
+			spec = share_graph(graph, segments)
+			with multiprocessing.Pool(
+				processes=min(workers, len(pending)),
+				initializer=_init_worker,
+				initargs=(spec, input_type, type(solver), options, solver.stats is not None),
+			) as pool:
+				chunksize = max(1, len(pending) // (4 * workers))
+				solved = pool.map(_solve, pending, chunksize)
+		finally:
+			for segment in segments:
+				segment.close()
+				segment.unlink()
+
+		# dictionary keys need not be contiguous, and the CSR copy fills the gaps with unreachable nodes
+		trim = solver.input_type == InputType.DICTIONARY and len(solver.graph) != graph.n_nodes
+		for start, (result, stats) in zip(pending, solved):
+			if trim and isinstance(result, ShortestPaths):
+				result = result.subset(solver.graph)
+			if stats is not None:
+				solver.stats.merge(stats)
+			if solver.cache is not None:
+				solver._count('cache_misses')
+				solver.cache.put(solver._cache_key(start), result)
+			results[start] = result
+
+	if solver.cache is not None:
+		# cached entries stay private to the cache, as with Solver._cached
+		return [results[start].copy() for start in starts]
+	return [results[start] for start in starts]
@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import json
+import math
+from typing import Optional
+from graph_algorithms import Algorithms, AlgorithmsFactory
+from input_factory import AlgorithmType, FileInputFactory, InputType
+
+
+class ServerBusy(RuntimeError):
+	pass
+
+
+class _Inflight:
+	# one coalesced solve: how many callers still wait on it and the latest moment any of them would accept an answer
+	def __init__(self):
+		self.future = None
+		self.waiters = 0
+		self.expires = -math.inf
+
+
+class QueryServer:
+	def __init__(self, max_pending: int = 256, workers: Optional[int] = None, default_deadline: Optional[float] = None):
+		self.max_pending = max_pending
+		self.default_deadline = default_deadline
+		self.graphs = {}
+		self.stats = Counter()
+		self._executor = ThreadPoolExecutor(max_workers=workers)
+		self._inflight = {}
+		self._locks = {}
+		self._pending = 0
+
+	def register(self, name: str, algorithm: Algorithms) -> None:
+		# the algorithm arrives with its graph, engine and any index already set up; queries only solve
+		self.graphs[name] = algorithm
+		self._locks[name] = asyncio.Lock()
+
+	def load(self, name: str, algorithm_type: AlgorithmType, path: str, input_type: InputType = InputType.CSR) -> Algorithms:
+		algorithm = AlgorithmsFactory.get_algorithm(algorithm_type)
+		algorithm.set_input_type(input_type)
+		algorithm.set_input_factory(FileInputFactory(path, input_type))
+		algorithm.generate_input()
+		self.register(name, algorithm)
+		return algorithm
+
+	async def query(self, name: str, start: int, target: Optional[int] = None, deadline: Optional[float] = None):
+		if name not in self.graphs:
+			raise ValueError(f"No graph named {name}")
+		deadline = deadline if deadline is not None else self.default_deadline
+		key = (name, start, target)
+		entry = self._inflight.get(key)
+		if entry is not None:
+			self.stats['coalesced'] += 1
+		else:
+			if self._pending >= self.max_pending:
+				self.stats['rejected'] += 1
+				raise ServerBusy(f"{self._pending} queries already pending")
+			self._pending += 1
+			entry = _Inflight()
+			self._inflight[key] = entry
+			entry.future = asyncio.ensure_future(self._run(key, entry))
+			# an outcome nobody waits for any more is dropped without a "never retrieved" warning
+			entry.future.add_done_callback(lambda future: future.cancelled() or future.exception())
+		entry.waiters += 1
+		expires = math.inf if deadline is None else asyncio.get_running_loop().time() + deadline
+		entry.expires = max(entry.expires, expires)
+		# shielded so a caller hitting its deadline does not cancel the solve other callers share
+		try:
+			return await asyncio.wait_for(asyncio.shield(entry.future), deadline)
+		except asyncio.TimeoutError:
+			self.stats['timeouts'] += 1
+			raise
+		finally:
+			entry.waiters -= 1
+			if not entry.waiters:
+				# the slot goes back as soon as nobody waits; a solve still queued on the graph lock is then skipped
+				self._release(key, entry)
+
+	def _release(self, key: tuple, entry: _Inflight) -> None:
+		# a key may already be served by a newer entry once this one was released
+		if self._inflight.get(key) is entry:
+			del self._inflight[key]
+			self._pending -= 1
+
+	async def _run(self, key: tuple, entry: _Inflight):
+		name, start, target = key
+		algorithm = self.graphs[name]
+		try:
+			# solvers keep per-graph state, so solves on one graph are serialised and different graphs run side by side
+			async with self._locks[name]:
+				loop = asyncio.get_running_loop()
+				if not entry.waiters or entry.expires <= loop.time():
+					self.stats['expired'] += 1
+					raise asyncio.TimeoutError()
+				if target is None:
+					result = await loop.run_in_executor(self._executor, algorithm.solve, start)
+				else:
+					result = await loop.run_in_executor(self._executor, algorithm.solve, start, target)
+			self.stats['solved'] += 1
+			return result
+		finally:
+			self._release(key, entry)
+
+	async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		# one JSON request per line; replies carry the request id and may come back out of order
+		write_lock = asyncio.Lock()
+		tasks = set()
+
+		async def answer(line: bytes):
+			request = {}
+			try:
+				request = json.loads(line)
+				result = await self.query(request['graph'], request['start'], request.get('target'), request.get('deadline'))
+				reply = {'id': request.get('id'), 'result': encode(result)}
+			except asyncio.TimeoutError:
+				reply = {'id': request.get('id'), 'error': 'deadline exceeded'}
+			except Exception as e:
+				reply = {'id': request.get('id') if isinstance(request, dict) else None, 'error': str(e)}
+			async with write_lock:
+				writer.write(json.dumps(reply).encode() + b'\n')
+				await writer.drain()
+
+		try:
+			while line := await reader.readline():
+				if line.strip():
+					task = asyncio.create_task(answer(line))
+					tasks.add(task)
+					task.add_done_callback(tasks.discard)
+			if tasks:
+				await asyncio.gather(*tasks)
+		finally:
+			writer.close()
+
+	async def serve(self, host: str = '127.0.0.1', port: int = 8765, path: Optional[str] = None) -> asyncio.AbstractServer:
+		if path is not None:
+			return await asyncio.start_unix_server(self.handle, path)
+		return await asyncio.start_server(self.handle, host, port)
+
+	def close(self) -> None:
+		self._executor.shutdown(wait=False)
+
+
+def encode(result):
+	# JSON-safe form: dict keys become strings and unreachable distances become null
+	if isinstance(result, dict):
+		return {str(node): None if value == math.inf else value for node, value in result.items()}
+	if isinstance(result, list):
+		return [list(item) if isinstance(item, tuple) else item for item in result]
+	return result
+
+
+def main(argv=None) -> None:
+	parser = argparse.ArgumentParser(description="Serve shortest-path and spanning-tree queries over preloaded graphs")
+	parser.add_argument("graphs", nargs="+", help="name=ALGORITHM:path[:INPUT_TYPE]")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8765)
+	parser.add_argument("--socket", help="listen on a unix socket instead of TCP")
+	parser.add_argument("--max-pending", type=int, default=256)
+	parser.add_argument("--workers", type=int)
+	parser.add_argument("--deadline", type=float)
+	args = parser.parse_args(argv)
+
+	async def run():
+		server = QueryServer(args.max_pending, args.workers, args.deadline)
+		for spec in args.graphs:
+			name, _, rest = spec.partition("=")
+			algorithm, path, *input_type = rest.split(":")
+			server.load(name, AlgorithmType[algorithm], path, InputType[input_type[0]] if input_type else InputType.CSR)
+		listener = await server.serve(args.host, args.port, args.socket)
+		async with listener:
+			await listener.serve_forever()
+
+	asyncio.run(run())
+
+
+if __name__ == "__main__":
+	main()
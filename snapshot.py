@@ -0,0 +1,162 @@
+import json
+import mmap
+import struct
+import zlib
+from typing import Optional
+import numpy as np
+from input_factory import CSRGraph, InputType
+from solvers import ShortestPaths
+
+# layout: header, JSON metadata, section table, then 8-byte aligned sections in table order
+# each section is a flat array of one struct typecode, optionally zlib-compressed, with a crc32 of its stored bytes
+SNAPSHOT_VERSION = 1
+_MAGIC = b'GASNAP\x00\x00'
+_HEADER = struct.Struct('<8sHHIqq')
+_SECTION = struct.Struct('<16scB6xqqqqI4x')
+_RAW, _ZLIB = 0, 1
+
+
+def _align(n: int) -> int:
+	return (n + 7) & ~7
+
+
+def write_snapshot(path: str, kind: str, sections: dict, meta: Optional[dict] = None, compress: bool = False) -> None:
+	meta_bytes = json.dumps({'kind': kind, **(meta or {})}).encode()
+	table, payloads = [], []
+	offset = end = _align(_HEADER.size + len(meta_bytes)) + _SECTION.size * len(sections)
+	for name, data in sections.items():
+		data = np.asarray(data)
+		rows = data.shape[0] if data.ndim == 2 else 0
+		typecode = {'i': 'q', 'u': 'q', 'b': 'q', 'f': 'd'}[data.dtype.kind]
+		raw = np.ascontiguousarray(data, dtype='<i8' if typecode == 'q' else '<f8').tobytes()
+		stored = zlib.compress(raw) if compress else raw
+		table.append(_SECTION.pack(name.encode(), typecode.encode(), _ZLIB if compress else _RAW,
+			offset, len(stored), len(raw), rows, zlib.crc32(stored)))
+		payloads.append((offset, stored))
+		end = offset + len(stored)
+		offset = _align(end)
+
+	with open(path, 'wb') as f:
+		f.write(_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, len(sections), zlib.crc32(meta_bytes), len(meta_bytes), end))
+		f.write(meta_bytes)
+		f.write(bytes(_align(f.tell()) - f.tell()))
+		for entry in table:
+			f.write(entry)
+		for position, stored in payloads:
+			f.write(bytes(position - f.tell()))
+			f.write(stored)
+
+
+def read_snapshot(path: str, verify: bool = True) -> tuple:
+	# raw sections come back as memoryviews straight over the mapped file; only compressed ones are copied
+	with open(path, 'rb') as f:
+		mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+	magic, version, n_sections, meta_crc, meta_length, size = _HEADER.unpack_from(mapped)
+	if magic != _MAGIC:
+		raise ValueError(f"{path} is not a snapshot")
+	if version > SNAPSHOT_VERSION:
+		raise ValueError(f"{path} uses snapshot version {version}, newer than {SNAPSHOT_VERSION}")
+	if len(mapped) < size:
+		raise ValueError(f"{path} is truncated")
+	view = memoryview(mapped)
+	meta_bytes = view[_HEADER.size:_HEADER.size + meta_length]
+	if verify and zlib.crc32(meta_bytes) != meta_crc:
+		raise ValueError(f"{path} has a corrupt header")
+	meta = json.loads(bytes(meta_bytes))
+
+	sections = {}
+	position = _align(_HEADER.size + meta_length)
+	for _ in range(n_sections):
+		name, typecode, codec, offset, stored, raw, rows, crc = _SECTION.unpack_from(mapped, position)
+		position += _SECTION.size
+		name, typecode = name.rstrip(b'\x00').decode(), typecode.decode()
+		data = view[offset:offset + stored]
+		if verify and zlib.crc32(data) != crc:
+			raise ValueError(f"{path} has a corrupt '{name}' section")
+		if codec == _ZLIB:
+			data = memoryview(zlib.decompress(data))
+		data = data.cast(typecode)
+		sections[name] = data if not rows else np.frombuffer(data, dtype=np.float64 if typecode == 'd' else np.int64).reshape(rows, -1)
+	return meta, sections
+
+
+def save_graph(path: str, graph, input_type: InputType, compress: bool = False) -> None:
+	match input_type:
+		case InputType.CSR:
+			write_snapshot(path, 'graph', {'offsets': graph.offsets, 'targets': graph.targets, 'weights': graph.weights},
+				{'input_type': input_type.name}, compress)
+		case InputType.DICTIONARY:
+			# stored as CSR plus the key list; MST fixtures keep their (cost, to, from) entries
+			csr = CSRGraph.from_dict(graph)
+			undirected = any(len(item) == 3 for items in graph.values() for item in items)
+			write_snapshot(path, 'graph', {'offsets': csr.offsets, 'targets': csr.targets, 'weights': csr.weights,
+				'nodes': np.fromiter(graph, dtype=np.int64, count=len(graph))},
+				{'input_type': input_type.name, 'undirected': undirected}, compress)
+		case InputType.ADJACENCY_MATRIX:
+			write_snapshot(path, 'graph', {'matrix': np.asarray(graph, dtype=np.float64)}, {'input_type': input_type.name}, compress)
+		case _:
+			raise ValueError("Invalid input type")
+
+
+def load_graph(path: str, verify: bool = True) -> tuple:
+	meta, sections = read_snapshot(path, verify)
+	if meta['kind'] != 'graph':
+		raise ValueError(f"{path} holds a {meta['kind']} snapshot, not a graph")
+	input_type = InputType[meta['input_type']]
+	match input_type:
+		case InputType.CSR:
+			return CSRGraph(sections['offsets'], sections['targets'], sections['weights']), input_type
+		case InputType.DICTIONARY:
+			csr = CSRGraph(sections['offsets'], sections['targets'], sections['weights'])
+			if meta['undirected']:
+				return {node: [(cost, to_node, node) for cost, to_node in csr.neighbors(node)] for node in sections['nodes']}, input_type
+			return {node: list(csr.neighbors(node)) for node in sections['nodes']}, input_type
+		case InputType.ADJACENCY_MATRIX:
+			return sections['matrix'], input_type
+
+
+def save_distances(path: str, result: ShortestPaths, compress: bool = False) -> None:
+	nodes, distances, predecessors = result.to_arrays()
+	write_snapshot(path, 'distances', {'nodes': nodes, 'distances': distances, 'predecessors': predecessors},
+		{'start': result.start}, compress)
+
+
+def load_distances(path: str, verify: bool = True) -> ShortestPaths:
+	meta, sections = read_snapshot(path, verify)
+	if meta['kind'] != 'distances':
+		raise ValueError(f"{path} holds a {meta['kind']} snapshot, not distances")
+	result = ShortestPaths(zip(sections['nodes'], sections['distances']))
+	result.start = meta['start']
+	# the predecessor array is used as is, so path() walks the mapped file directly
+	result.predecessors = sections['predecessors']
+	return result
+
+
+def save_mst(path: str, MST: list, compress: bool = False) -> None:
+	costs = [edge[0] for edge in MST]
+	write_snapshot(path, 'mst', {
+		'costs': np.asarray(costs, dtype=np.int64 if all(isinstance(cost, int) for cost in costs) else np.float64),
+		'low': np.asarray([edge[1] for edge in MST], dtype=np.int64),
+		'high': np.asarray([edge[2] for edge in MST], dtype=np.int64),
+	}, None, compress)
+
+
+def load_mst(path: str, verify: bool = True) -> list:
+	meta, sections = read_snapshot(path, verify)
+	if meta['kind'] != 'mst':
+		raise ValueError(f"{path} holds a {meta['kind']} snapshot, not an MST")
+	return list(zip(sections['costs'], sections['low'], sections['high']))
+
+
+def save_all_pairs(path: str, distances: np.ndarray, predecessors: Optional[np.ndarray] = None, compress: bool = False) -> None:
+	sections = {'distances': distances}
+	if predecessors is not None:
+		sections['predecessors'] = predecessors
+	write_snapshot(path, 'all_pairs', sections, None, compress)
+
+
+def load_all_pairs(path: str, verify: bool = True) -> tuple:
+	meta, sections = read_snapshot(path, verify)
+	if meta['kind'] != 'all_pairs':
+		raise ValueError(f"{path} holds a {meta['kind']} snapshot, not an all-pairs table")
+	return sections['distances'], sections.get('predecessors')
@@ -3,144 +3,1111 @@ from ctypes import Union
 import input_factory
 from input_factory import InputType
 import utils
-from utils import UnionFind
+from utils import UnionFind, IndexedHeap, ResultCache, SolverStats, graph_fingerprint
 import math
 import heapq
+from numbers import Integral
+import operator
+import struct
+from array import array
+import tempfile
+from collections import deque
+from contextlib import nullcontext
+from enum import Enum, auto
+from typing import Callable, Iterable, Iterator, KeysView, Optional
+import numpy as np
+
+class Engine(Enum):
+	PYTHON = auto()
+	NUMPY = auto()
+	QUEUE = auto()
+	ARRAY = auto()
+	INDEXED_HEAP = auto()
+	JOHNSON = auto()
+	DELTA_STEPPING = auto()
+
+class NegativeCycleError(ValueError):
+	def __init__(self, cycle: list):
+		super().__init__('Invalid input - negative cycle detected')
+		self.cycle = cycle
+
+class ShortestPaths(dict):
+	# {node: distance} plus a flat predecessor array (-1 for none), so routes are only rebuilt when asked for
+	start: Optional[int] = None
+	predecessors: Optional[array] = None
+
+	@classmethod
+	def tree(cls, nodes: Iterable[int], start: int, size: int) -> "ShortestPaths":
+		result = cls.fromkeys(nodes, math.inf)
+		result[start] = 0
+		result.start = start
+		result.predecessors = array('q', [-1]) * size
+		return result
+
+	@classmethod
+	def route(cls, start: int, target: int, distance, path: Optional[list]) -> "ShortestPaths":
+		# a point query: just the target's distance, with predecessors filled in along the route only
+		result = cls({target: distance})
+		result.start = start
+		result.predecessors = array('q', [-1]) * (max(path) + 1 if path else 0)
+		for previous, node in zip(path or (), (path or ())[1:]):
+			result.predecessors[node] = previous
+		return result
+
+	def copy(self) -> "ShortestPaths":
+		result = ShortestPaths(self)
+		result.start, result.predecessors = self.start, array('q', self.predecessors)
+		return result
+
+	def subset(self, nodes: Iterable[int]) -> "ShortestPaths":
+		result = ShortestPaths((node, self[node]) for node in nodes)
+		result.start, result.predecessors = self.start, self.predecessors
+		return result
+
+	def path(self, target: int) -> list:
+		if self.get(target, math.inf) == math.inf:
+			return []
+		predecessors = self.predecessors
+		path = [target]
+		while target != self.start:
+			target = predecessors[target]
+			path.append(target)
+		path.reverse()
+		return path
+
+	def to_arrays(self) -> tuple:
+		# (nodes, distances, predecessors); the predecessor array is shared, not copied
+		nodes = np.fromiter(self.keys(), dtype=np.int64, count=len(self))
+		distances = np.fromiter(self.values(), dtype=np.float64, count=len(self))
+		return nodes, distances, np.frombuffer(self.predecessors, dtype=np.int64)
+
+	@classmethod
+	def from_arrays(cls, start: int, nodes, distances, predecessors) -> "ShortestPaths":
+		result = cls(zip(np.asarray(nodes).tolist(), np.asarray(distances).tolist()))
+		result.start = start
+		result.predecessors = array('q', np.asarray(predecessors, dtype=np.int64).tobytes())
+		return result
+
+def adjacency(graph, input_type: InputType) -> tuple:
+	# (nodes, neighbors) where neighbors(node) yields (cost, to_node) for any input type
+	match input_type:
+		case InputType.DICTIONARY:
+			return list(graph), lambda node: ((item[0], item[1]) for item in graph[node])
+		case InputType.ADJACENCY_MATRIX:
+			return range(len(graph)), lambda node: ((cost, nxt) for nxt, cost in enumerate(graph[node]) if cost != 0 and cost != math.inf)
+		case InputType.CSR:
+			return range(graph.n_nodes), graph.neighbors
+		case _:
+			raise ValueError("Invalid input type")
+
+def reverse_adjacency(graph, input_type: InputType) -> dict:
+	# incoming edges per node as (cost, from_node), the backward half of a bidirectional search
+	nodes, neighbors = adjacency(graph, input_type)
+	reverse = {node: [] for node in nodes}
+	for node in nodes:
+		for cost, to_node in neighbors(node):
+			reverse.setdefault(to_node, []).append((cost, node))
+	return reverse
+
+def edit_edge(graph, input_type: InputType, from_node: int, to_node: int, cost, exists: bool, undirected: bool = False) -> None:
+	# cost=None deletes the edge; exists is what the caller expects to find before the edit
+	_edit_entry(graph, input_type, from_node, to_node, cost, exists, undirected)
+	if undirected:
+		_edit_entry(graph, input_type, to_node, from_node, cost, exists, undirected)
+
+def _edit_entry(graph, input_type: InputType, from_node: int, to_node: int, cost, exists: bool, undirected: bool) -> None:
+	match input_type:
+		case InputType.DICTIONARY:
+			items = graph.setdefault(from_node, [])
+			kept = [item for item in items if item[1] != to_node]
+			if (len(kept) != len(items)) != exists:
+				raise ValueError(f"Edge {from_node}->{to_node} {'does not exist' if exists else 'already exists'}")
+			if cost is not None:
+				kept.append((cost, to_node, from_node) if undirected else (cost, to_node))
+				graph.setdefault(to_node, [])
+			items[:] = kept
+		case InputType.ADJACENCY_MATRIX:
+			missing = math.inf if undirected else 0
+			if cost == 0:
+				raise ValueError("Zero-cost edges cannot be stored in an adjacency matrix")
+			if (graph[from_node][to_node] not in (0, math.inf)) != exists:
+				raise ValueError(f"Edge {from_node}->{to_node} {'does not exist' if exists else 'already exists'}")
+			graph[from_node][to_node] = missing if cost is None else cost
+		case InputType.CSR:
+			if not exists or cost is None:
+				raise ValueError("CSR graphs have a fixed structure; only existing edge costs can be updated")
+			found = False
+			for i in range(graph.offsets[from_node], graph.offsets[from_node+1]):
+				if graph.targets[i] == to_node:
+					graph.weights[i] = cost
+					found = True
+			if not found:
+				raise ValueError(f"Edge {from_node}->{to_node} does not exist")
+		case _:
+			raise ValueError("Invalid input type")
 
 class Solver(ABC):
+	cache: Optional[ResultCache] = None
+	stats: Optional[SolverStats] = None
+	_fingerprint: Optional[str] = None
+	# engines the solver runs, each mapped to the input types it handles (None for all of them)
+	_engines: dict = {}
+
 	@abstractmethod
 	def solve():
 		pass
 
-class DijkstraSolver(Solver):
+	def set_cache(self, cache: Optional[ResultCache]):
+		self.cache = cache
+		self._fingerprint = None
+
+	def set_stats(self, stats: Optional[SolverStats]):
+		self.stats = stats
+
+	def _counted(self, func, name: str):
+		return func if self.stats is None else self.stats.counting(func, name)
+
+	def _count(self, name: str, n: int = 1):
+		if self.stats is not None:
+			self.stats.count(name, n)
+
+	def _record(self, name: str, value):
+		if self.stats is not None:
+			self.stats.values[name] = value
+
+	def _phase(self, name: str):
+		return nullcontext() if self.stats is None else self.stats.phase(name)
+
+	def _union_find(self, n: int) -> UnionFind:
+		uf = UnionFind(n)
+		if self.stats is not None:
+			# union looks find up on the instance, so this also counts the finds it makes
+			uf.find = self.stats.counting(uf.find, 'finds')
+		return uf
+
+	def _check_engine(self, engine: Engine):
+		if engine not in self._engines:
+			raise ValueError(f"Invalid engine {engine.name} for {type(self).__name__}")
+		supported = self._engines[engine]
+		if supported is not None and self.input_type is not None and self.input_type not in supported:
+			raise ValueError(f"The {engine.name} engine does not run on {self.input_type.name} input")
+
+	def _graph_changed(self):
+		self._graph_edited()
+
+	def _graph_edited(self):
+		# entries of the outgoing graph are dropped since it may be mutated in place later
+		if self.cache is not None and self._fingerprint is not None:
+			self.cache.invalidate(self._fingerprint)
+		self._fingerprint = None
+
+	def _cache_key(self, start: int, *key) -> tuple:
+		# a plain solve(start) is keyed by the start alone, which parallel.solve_many relies on
+		if self._fingerprint is None:
+			self._fingerprint = graph_fingerprint(self.graph)
+		return (self._fingerprint, type(self).__name__, start, *key)
+
+	def _cached(self, compute, start: int, *key):
+		key = self._cache_key(start, *key)
+		result = self.cache.get(key)
+		if result is None:
+			self._count('cache_misses')
+			result = compute()
+			self.cache.put(key, result)
+		else:
+			self._count('cache_hits')
+		return result.copy()
+
+class _TreeParents:
+	# predecessor array of a tracked tree plus a children index, kept in step so a subtree is found without a scan
+	def __init__(self, predecessors: array):
+		self.predecessors = predecessors
+		self.children = {}
+		for node, parent in enumerate(predecessors):
+			if parent >= 0:
+				self.children.setdefault(parent, set()).add(node)
+
+	def __getitem__(self, node: int) -> int:
+		return self.predecessors[node] if node < len(self.predecessors) else -1
+
+	def __setitem__(self, node: int, parent: int):
+		previous = self.predecessors[node]
+		if previous >= 0:
+			self.children[previous].discard(node)
+		self.predecessors[node] = parent
+		if parent >= 0:
+			self.children.setdefault(parent, set()).add(node)
+
+	def grow(self, node: int):
+		if node >= len(self.predecessors):
+			self.predecessors.extend([-1] * (node + 1 - len(self.predecessors)))
+
+	def subtree(self, root: int) -> set:
+		subtree, stack = set(), [root]
+		while stack:
+			node = stack.pop()
+			subtree.add(node)
+			stack.extend(self.children.get(node, ()))
+		return subtree
+
+class ShortestPathSolver(Solver):
+	# distance tree (distances, parents, reverse costs, neighbors) kept for incremental edits
+	_tracked_start: Optional[int] = None
+	_tree: Optional[tuple] = None
+
+	# edits return the tracked tree itself, a live ShortestPaths that later edits keep updating
+	def update_edge(self, from_node: int, to_node: int, cost) -> ShortestPaths:
+		return self._apply_edit(from_node, to_node, cost, exists=True)
+
+	def insert_edge(self, from_node: int, to_node: int, cost) -> ShortestPaths:
+		return self._apply_edit(from_node, to_node, cost, exists=False)
+
+	def delete_edge(self, from_node: int, to_node: int) -> ShortestPaths:
+		return self._apply_edit(from_node, to_node, None, exists=True)
+
+	def _graph_changed(self):
+		super()._graph_changed()
+		self._tracked_start = self._tree = None
+
+	def _track(self, start: int):
+		if start != self._tracked_start:
+			self._tracked_start, self._tree = start, None
+
+	@abstractmethod
+	def _propagate(self, distances: dict, predecessors, seeds: list, neighbors):
+		pass
+
+	def _build_tree(self, start: int) -> tuple:
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		reverse = {}
+		for node in nodes:
+			for cost, to_node in neighbors(node):
+				costs = reverse.setdefault(to_node, {})
+				costs[node] = min(cost, costs.get(node, math.inf))
+		distances = ShortestPaths.tree(nodes, start, max(nodes) + 1)
+		self._propagate(distances, distances.predecessors, [start], neighbors)
+		return distances, _TreeParents(distances.predecessors), reverse, neighbors
+
+	def _apply_edit(self, from_node: int, to_node: int, cost, exists: bool) -> ShortestPaths:
+		if self._tracked_start is None:
+			raise ValueError("solve() must run before the graph can be updated")
+		if self._tree is None:
+			self._tree = self._build_tree(self._tracked_start)
+		distances, parents, reverse, neighbors = self._tree
+
+		edit_edge(self.graph, self.input_type, from_node, to_node, cost, exists)
+		self._graph_edited()
+		for node in (from_node, to_node):
+			distances.setdefault(node, math.inf)
+			parents.grow(node)
+		if cost is None:
+			reverse.get(to_node, {}).pop(from_node, None)
+		else:
+			reverse.setdefault(to_node, {})[from_node] = cost
+
+		try:
+			if parents[to_node] == from_node and (cost is None or distances[from_node] + cost > distances[to_node]):
+				# a tree edge got worse: only its subtree can change, re-seed it from outside
+				subtree = parents.subtree(to_node)
+				for node in subtree:
+					distances[node] = math.inf
+					parents[node] = -1
+				seeds = []
+				for node in subtree:
+					for parent, parent_cost in reverse.get(node, {}).items():
+						if parent not in subtree and distances[parent] + parent_cost < distances[node]:
+							distances[node] = distances[parent] + parent_cost
+							parents[node] = parent
+					if distances[node] != math.inf:
+						seeds.append(node)
+				self._propagate(distances, parents, seeds, neighbors)
+			elif cost is not None and distances[from_node] + cost < distances[to_node]:
+				distances[to_node] = distances[from_node] + cost
+				parents[to_node] = from_node
+				self._propagate(distances, parents, [to_node], neighbors)
+		except ValueError:
+			self._tree = None
+			raise
+
+		return distances
+
+class SpanningTreeSolver(Solver):
+	# current forest as {node: {neighbour: (cost, node1, node2)}}, kept for incremental edits
+	_forest: Optional[dict] = None
+	# the same forest as {(cost, low, high): None}; edits hand out its live keys view
+	_edges: Optional[dict] = None
+	# each tree rooted somewhere as {node: parent}, so a tree path only climbs to the common ancestor
+	_parent: Optional[dict] = None
+	# start node when the forest only spans the component it was grown from, None for a full spanning forest
+	_root: Optional[int] = None
+
+	def update_edge(self, node1: int, node2: int, cost) -> KeysView:
+		return self._apply_edit(node1, node2, cost, exists=True)
+
+	def insert_edge(self, node1: int, node2: int, cost) -> KeysView:
+		return self._apply_edit(node1, node2, cost, exists=False)
+
+	def delete_edge(self, node1: int, node2: int) -> KeysView:
+		return self._apply_edit(node1, node2, None, exists=True)
+
+	def _graph_changed(self):
+		super()._graph_changed()
+		self._forest = self._edges = self._parent = None
+
+	def _remember(self, MST: list) -> list:
+		# the edge dict is refilled in place so views handed out by earlier edits stay live
+		self._forest = {}
+		if self._edges is None:
+			self._edges = {}
+		self._edges.clear()
+		for edge in MST:
+			self._add(edge)
+		self._parent = {}
+		for root in self._forest:
+			if root in self._parent:
+				continue
+			self._parent[root] = None
+			stack = [root]
+			while stack:
+				node = stack.pop()
+				for nxt in self._forest[node]:
+					if nxt not in self._parent:
+						self._parent[nxt] = node
+						stack.append(nxt)
+		return MST
+
+	def _link(self, edge: tuple):
+		# joins two trees: the second endpoint becomes the root of its tree and hangs off the first
+		_, node1, node2 = edge
+		self._evert(node2)
+		self._parent.setdefault(node1, None)
+		self._parent[node2] = node1
+		self._add(edge)
+
+	def _evert(self, node: int):
+		# reverses the parent pointers from node up to its root, making node the root
+		parent, previous = self._parent.get(node), None
+		while node is not None:
+			self._parent[node] = previous
+			previous, node = node, parent
+			parent = self._parent.get(node) if node is not None else None
+
+	def _add(self, edge: tuple):
+		cost, node1, node2 = edge
+		edge = (cost, min(node1, node2), max(node1, node2))
+		previous = self._forest.setdefault(node1, {}).get(node2)
+		if previous is not None:
+			del self._edges[previous]
+		self._forest[node1][node2] = edge
+		self._forest.setdefault(node2, {})[node1] = edge
+		self._edges[edge] = None
+
+	def _cut(self, node1: int, node2: int):
+		del self._edges[self._forest[node1].pop(node2)]
+		del self._forest[node2][node1]
+		child = node2 if self._parent.get(node2) == node1 else node1
+		self._parent[child] = None
+
+	def _drop(self, nodes: Iterable[int]):
+		for node in nodes:
+			self._parent.pop(node, None)
+			for edge in self._forest.pop(node, {}).values():
+				self._edges.pop(edge, None)
+
+	def _spans(self, node: int) -> bool:
+		# whether a grown tree holds node; every tree node but a lone root has a forest edge
+		return node == self._root or bool(self._forest.get(node))
+
+	def _tree_path(self, source: int, target: int) -> Optional[list]:
+		# climbs from source to its root, then from target until it meets that chain at the common ancestor
+		parent = self._parent
+		depth, node = {}, source
+		while node is not None:
+			depth[node] = len(depth)
+			node = parent.get(node)
+		climbed, node = [], target
+		while node not in depth:
+			if parent.get(node) is None:
+				return None
+			climbed.append(self._forest[node][parent[node]])
+			node = parent[node]
+		path, ancestor, node = climbed, node, source
+		while node != ancestor:
+			path.append(self._forest[node][parent[node]])
+			node = parent[node]
+		return path
+
+	def _component(self, root: int) -> set:
+		seen, stack = {root}, [root]
+		while stack:
+			for nxt in self._forest.get(stack.pop(), ()):
+				if nxt not in seen:
+					seen.add(nxt)
+					stack.append(nxt)
+		return seen
+
+	def _smaller_side(self, node1: int, node2: int) -> tuple:
+		# after a cut, both halves are walked in lockstep and the first one finished is returned with the other endpoint
+		seen, stacks = ({node1}, {node2}), ([node1], [node2])
+		while True:
+			for side in (0, 1):
+				if not stacks[side]:
+					return seen[side], (node2, node1)[side]
+				for nxt in self._forest.get(stacks[side].pop(), ()):
+					if nxt not in seen[side]:
+						seen[side].add(nxt)
+						stacks[side].append(nxt)
+
+	def _apply_edit(self, node1: int, node2: int, cost, exists: bool) -> KeysView:
+		if self._forest is None:
+			raise ValueError("solve() must run before the graph can be updated")
+		in_tree = node2 in self._forest.get(node1, {})
+		edit_edge(self.graph, self.input_type, node1, node2, cost, exists, undirected=True)
+		self._graph_edited()
+		edge = None if cost is None else (cost, min(node1, node2), max(node1, node2))
+
+		if in_tree and edge is not None and cost <= self._forest[node1][node2][0]:
+			self._add(edge)
+		elif in_tree:
+			# cut replacement: cheapest edge reconnecting the two halves, scanned from the smaller one
+			self._cut(node1, node2)
+			side, other = self._smaller_side(node1, node2)
+			_, neighbors = adjacency(self.graph, self.input_type)
+			best = None
+			# every graph neighbour outside the scanned half sits in the other half of the same tree
+			for node in side:
+				for weight, nxt in neighbors(node):
+					if nxt not in side and (best is None or weight < best[0]):
+						best = (weight, min(node, nxt), max(node, nxt))
+			if best is not None:
+				self._link(best)
+			elif self._root is not None:
+				self._drop(self._component(other) if self._root in side else side)
+		elif edge is not None:
+			# cycle replacement: the new edge displaces the heaviest edge on the tree path
+			path = self._tree_path(node1, node2)
+			if path is None and self._root is None:
+				self._link(edge)
+			elif path is None:
+				# a grown tree only changes when the edge reaches it, and then a whole component may join
+				if self._spans(node1) or self._spans(node2):
+					self._remember(self._solve(self._root))
+			else:
+				heaviest = max(path)
+				if cost < heaviest[0]:
+					self._cut(heaviest[1], heaviest[2])
+					self._link(edge)
+
+		return self._edges.keys()
+
+class DijkstraSolver(ShortestPathSolver):
+	_engines = {Engine.PYTHON: None, Engine.INDEXED_HEAP: None, Engine.DELTA_STEPPING: None}
+
 	def __init__(self):
 		self.graph = None
 		self.input_type = None
+		self.engine = Engine.PYTHON
+		self.heuristic = None
+		self.hierarchy = None
+		self.delta = None
+		self._reverse = None
+		self._arrays = None
 
 	def set_graph(self, graph):
+		self._graph_changed()
 		self.graph = graph
 
 	def set_input_type(self, input_type):
 		self.input_type = input_type
+		self._reverse = None
+		self._arrays = None
+
+	def set_engine(self, engine: Engine):
+		self._check_engine(engine)
+		self.engine = engine
+
+	def set_heuristic(self, heuristic: Optional[Callable[[int, int], float]]):
+		# heuristic(node, target) must never overestimate; with one set, point queries run A*
+		self.heuristic = heuristic
+
+	def set_hierarchy(self, hierarchy):
+		# a prebuilt contraction.ContractionHierarchy for this graph answers point queries; edits drop it
+		self.hierarchy = hierarchy
+
+	def set_delta(self, delta: Optional[float]):
+		# bucket width for Engine.DELTA_STEPPING; None picks one from the edge weights
+		self.delta = delta
+
+	def _graph_edited(self):
+		super()._graph_edited()
+		self._reverse = None
+		self._arrays = None
+		self.hierarchy = None
+
+	def solve(self, start: int, targets: Optional[int | Iterable[int]] = None) -> dict:
+		self._track(start)
+		if isinstance(targets, Integral):
+			# numpy scalars are single targets too, and as plain ints they share cache entries with them
+			targets = operator.index(targets)
+		with self._phase('solve'):
+			if self.cache is not None:
+				key = () if targets is None else (targets if isinstance(targets, int) else frozenset(targets),)
+				return self._cached(lambda: self._solve(start, targets), start, *key)
+			return self._solve(start, targets)
 		
-	def solve(self, start: int) -> dict:
+	def _solve(self, start: int, targets: Optional[int | Iterable[int]] = None) -> dict:
 		if not self.input_type:
 			raise ValueError("An input type must be set first")
-		if not self.graph:
+		if self.graph is None or not len(self.graph):
 			raise ValueError("No graph exists")
+		self._check_engine(self.engine)
+		if isinstance(targets, Integral):
+			if self.hierarchy is not None:
+				return ShortestPaths.route(start, targets, *self.hierarchy.route(start, targets))
+			if self.heuristic is not None:
+				return self._solve_astar(start, targets)
+			return self._solve_bidirectional(start, targets)
+		if self.engine == Engine.INDEXED_HEAP:
+			return self._solve_indexed(start, targets)
+		if self.engine == Engine.DELTA_STEPPING:
+			return self._select(self._solve_delta(start), targets)
+		remaining = set(targets) if targets is not None else None
+		push, pop = self._counted(heapq.heappush, 'heap_pushes'), self._counted(heapq.heappop, 'heap_pops')
+		stale = relaxed = 0
 		match self.input_type:
 			case InputType.DICTIONARY:
-				shortest_paths = {}
-				for node in self.graph:
-					shortest_paths[node] = math.inf
-				
-				shortest_paths[start] = 0
+				shortest_paths = ShortestPaths.tree(self.graph, start, max(self.graph) + 1)
+				predecessors = shortest_paths.predecessors
 				visited = set()
 
-				visited.add(start)
-
 				heap = []
-				heapq.heappush(heap, (0, start))
+				push(heap, (0, start))
 	
 				while heap:
-					distance, node = heapq.heappop(heap)
+					distance, node = pop(heap)
+					if node in visited:
+						stale += 1
+						continue
 					visited.add(node)
+					if remaining is not None:
+						remaining.discard(node)
+						if not remaining:
+							break
 
+					relaxed += len(self.graph[node])
 					for cost, to_node in self.graph[node]:
 						if to_node not in visited and distance + cost < shortest_paths[to_node]:
 							shortest_paths[to_node] = distance + cost
-							heapq.heappush(heap, (shortest_paths[to_node], to_node))
+							predecessors[to_node] = node
+							push(heap, (shortest_paths[to_node], to_node))
 					
-				return shortest_paths
+				self._count('stale_pops', stale)
+				self._count('edge_relaxations', relaxed)
+				return self._select(shortest_paths, targets)
 			case InputType.ADJACENCY_MATRIX:
 				n = len(self.graph)
-				shortest_paths = {}
-				for node in range(n):
-					shortest_paths[node] = math.inf
-				shortest_paths[start] = 0
+				shortest_paths = ShortestPaths.tree(range(n), start, n)
+				predecessors = shortest_paths.predecessors
 
 				visit = set()
-				visit.add(start)
 
 				heap = []
-				heapq.heappush(heap, (0, start))
+				push(heap, (0, start))
 				
 				while heap:
-					distance, node = heapq.heappop(heap)
+					distance, node = pop(heap)
+					if node in visit:
+						stale += 1
+						continue
 					visit.add(node)
+					if remaining is not None:
+						remaining.discard(node)
+						if not remaining:
+							break
+
 					for to_node, cost in enumerate(self.graph[node]):
-						if cost != 0 and to_node not in visit and distance + cost < shortest_paths[to_node]:
+						if cost == 0:
+							continue
+						relaxed += 1
+						if to_node not in visit and distance + cost < shortest_paths[to_node]:
 							shortest_paths[to_node] = distance + cost
-							heapq.heappush(heap, (shortest_paths[to_node], to_node))
+							predecessors[to_node] = node
+							push(heap, (shortest_paths[to_node], to_node))
 
-				return shortest_paths
+				self._count('stale_pops', stale)
+				self._count('edge_relaxations', relaxed)
+				return self._select(shortest_paths, targets)
+			case InputType.CSR:
+				offsets, to_nodes, weights = self.graph.offsets, self.graph.targets, self.graph.weights
+				shortest_paths = ShortestPaths.tree(range(self.graph.n_nodes), start, self.graph.n_nodes)
+				predecessors = shortest_paths.predecessors
+
+				visited = set()
+				heap = []
+				push(heap, (0, start))
+
+				while heap:
+					distance, node = pop(heap)
+					if node in visited:
+						stale += 1
+						continue
+					visited.add(node)
+					if remaining is not None:
+						remaining.discard(node)
+						if not remaining:
+							break
+
+					relaxed += offsets[node+1] - offsets[node]
+					for i in range(offsets[node], offsets[node+1]):
+						to_node, cost = to_nodes[i], weights[i]
+						if to_node not in visited and distance + cost < shortest_paths[to_node]:
+							shortest_paths[to_node] = distance + cost
+							predecessors[to_node] = node
+							push(heap, (shortest_paths[to_node], to_node))
+
+				self._count('stale_pops', stale)
+				self._count('edge_relaxations', relaxed)
+				return self._select(shortest_paths, targets)
 			case _:
 				raise ValueError("Invalid input type")
 
-class BellmanFordSolver(Solver):
+	def _propagate(self, distances: dict, predecessors: dict, seeds: list, neighbors):
+		heap = [(distances[node], node) for node in seeds]
+		heapq.heapify(heap)
+		while heap:
+			distance, node = heapq.heappop(heap)
+			if distance > distances[node]:
+				continue
+			for cost, to_node in neighbors(node):
+				if distance + cost < distances.get(to_node, math.inf):
+					distances[to_node] = distance + cost
+					predecessors[to_node] = node
+					heapq.heappush(heap, (distance + cost, to_node))
+
+	def _solve_indexed(self, start: int, targets: Optional[Iterable[int]]) -> dict:
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		size = max(nodes) + 1
+		shortest_paths = ShortestPaths.tree(nodes, start, size)
+		predecessors = shortest_paths.predecessors
+		remaining = set(targets) if targets is not None else None
+
+		settled = bytearray(size)
+		heap = IndexedHeap(size)
+		push, pop = self._counted(heap.push, 'heap_pushes'), self._counted(heap.pop, 'heap_pops')
+		decrease_key = self._counted(heap.decrease_key, 'decrease_keys')
+		push(start, 0)
+		relaxed = 0
+
+		while heap:
+			distance, node = pop()
+			settled[node] = 1
+			if remaining is not None:
+				remaining.discard(node)
+				if not remaining:
+					break
+
+			for cost, to_node in neighbors(node):
+				relaxed += 1
+				if not settled[to_node] and distance + cost < shortest_paths[to_node]:
+					shortest_paths[to_node] = distance + cost
+					predecessors[to_node] = node
+					if to_node in heap:
+						decrease_key(to_node, distance + cost)
+					else:
+						push(to_node, distance + cost)
+
+		self._count('edge_relaxations', relaxed)
+		return self._select(shortest_paths, targets)
+
+	def _solve_bidirectional(self, start: int, target: int) -> dict:
+		_, forward = adjacency(self.graph, self.input_type)
+		if self._reverse is None:
+			self._reverse = reverse_adjacency(self.graph, self.input_type)
+		reverse = self._reverse
+		push, pop = self._counted(heapq.heappush, 'heap_pushes'), self._counted(heapq.heappop, 'heap_pops')
+
+		# index 0 grows from start over outgoing edges, index 1 from target over incoming ones
+		# parents point back towards start on side 0 and on towards target on side 1
+		distances = ({start: 0}, {target: 0})
+		parents = ({start: None}, {target: None})
+		settled = (set(), set())
+		heaps = ([(0, start)], [(0, target)])
+		expand = (forward, reverse.__getitem__)
+		best, meet = (0, (start, start)) if start == target else (math.inf, None)
+
+		while heaps[0] and heaps[1]:
+			# once the two frontiers together cost at least the best meeting point, nothing shorter is left
+			if heaps[0][0][0] + heaps[1][0][0] >= best:
+				break
+			side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+			distance, node = pop(heaps[side])
+			if node in settled[side]:
+				continue
+			settled[side].add(node)
+			mine, other = distances[side], distances[1 - side]
+
+			for cost, to_node in expand[side](node):
+				if distance + cost < mine.get(to_node, math.inf):
+					mine[to_node] = distance + cost
+					parents[side][to_node] = node
+					push(heaps[side], (distance + cost, to_node))
+				if to_node in other and distance + cost + other[to_node] < best:
+					# the best route so far crosses the edge between node and to_node, oriented start to target
+					best = distance + cost + other[to_node]
+					meet = (node, to_node) if side == 0 else (to_node, node)
+
+		self._count('settled', len(settled[0]) + len(settled[1]))
+		if meet is None:
+			return ShortestPaths.route(start, target, best, None)
+		# both half-trees are joined at the meeting edge
+		path, node = [], meet[0]
+		while node is not None:
+			path.append(node)
+			node = parents[0][node]
+		path.reverse()
+		node = meet[1]
+		while node is not None:
+			if node != path[-1]:
+				path.append(node)
+			node = parents[1][node]
+		return ShortestPaths.route(start, target, best, path)
+
+	def _solve_astar(self, start: int, target: int) -> dict:
+		_, neighbors = adjacency(self.graph, self.input_type)
+		heuristic = self.heuristic
+		push, pop = self._counted(heapq.heappush, 'heap_pushes'), self._counted(heapq.heappop, 'heap_pops')
+		distances = {start: 0}
+		parents = {start: None}
+		heap = [(heuristic(start, target), 0, start)]
+		settled = 0
+
+		while heap:
+			_, distance, node = pop(heap)
+			# entries are (estimate, distance, node); a node whose distance has since improved is stale
+			if distance > distances[node]:
+				continue
+			if node == target:
+				break
+			settled += 1
+			for cost, to_node in neighbors(node):
+				if distance + cost < distances.get(to_node, math.inf):
+					distances[to_node] = distance + cost
+					parents[to_node] = node
+					push(heap, (distance + cost + heuristic(to_node, target), distance + cost, to_node))
+
+		self._count('settled', settled)
+		if target not in distances:
+			return ShortestPaths.route(start, target, math.inf, None)
+		path, node = [], target
+		while node is not None:
+			path.append(node)
+			node = parents[node]
+		path.reverse()
+		return ShortestPaths.route(start, target, distances[target], path)
+
+	def _solve_delta(self, start: int) -> ShortestPaths:
+		if self._arrays is None:
+			match self.input_type:
+				case InputType.DICTIONARY:
+					graph = input_factory.CSRGraph.from_dict(self.graph)
+				case InputType.ADJACENCY_MATRIX:
+					graph = input_factory.CSRGraph.from_matrix(self.graph)
+				case InputType.CSR:
+					graph = self.graph
+				case _:
+					raise ValueError("Invalid input type")
+			offsets = np.asarray(graph.offsets, dtype=np.int64)
+			sources = np.repeat(np.arange(graph.n_nodes), np.diff(offsets))
+			self._arrays = (offsets, sources, np.asarray(graph.targets, dtype=np.int64), np.asarray(graph.weights, dtype=np.float64))
+		offsets, sources, to_nodes, weights = self._arrays
+		if len(weights) and weights.min() < 0:
+			raise ValueError("Delta-stepping needs non-negative edge costs")
+		n = len(offsets) - 1
+		delta = self.delta or (float(weights.mean()) if len(weights) else 1.0) or 1.0
+		light = weights <= delta
+
+		dist = np.full(n, np.inf)
+		dist[start] = 0
+		pred = np.full(n, -1, dtype=np.int64)
+		settled = np.zeros(n, dtype=bool)
+
+		def relax(frontier, keep):
+			# every edge leaving the frontier at once; returns the nodes whose distance dropped
+			edges = self._edge_range(offsets, frontier)
+			edges = edges[keep[edges]]
+			if not len(edges):
+				return edges
+			self._count('edge_relaxations', len(edges))
+			tails, heads = sources[edges], to_nodes[edges]
+			candidates = dist[tails] + weights[edges]
+			before = dist[heads]
+			np.minimum.at(dist, heads, candidates)
+			won = candidates < before
+			won &= candidates == dist[heads]
+			pred[heads[won]] = tails[won]
+			return np.unique(heads[won])
+
+		while True:
+			open_nodes = np.flatnonzero(~settled & (dist < np.inf))
+			if not len(open_nodes):
+				break
+			self._count('buckets')
+			bound = (np.floor(dist[open_nodes].min() / delta) + 1) * delta
+			frontier = open_nodes[dist[open_nodes] < bound]
+			bucket = [frontier]
+			# light edges can pull nodes back into the current bucket, so they are relaxed until it stops changing
+			while len(frontier):
+				improved = relax(frontier, light)
+				frontier = improved[dist[improved] < bound]
+				bucket.append(frontier)
+			bucket = np.unique(np.concatenate(bucket))
+			settled[bucket] = True
+			relax(bucket, ~light)
+
+		nodes = np.fromiter(self.graph, dtype=np.int64) if self.input_type == InputType.DICTIONARY else np.arange(n)
+		return ShortestPaths.from_arrays(start, nodes, dist[nodes], pred)
+
+	@staticmethod
+	def _edge_range(offsets, nodes):
+		# CSR edge indices of all the given nodes, concatenated without a python loop
+		counts = offsets[nodes + 1] - offsets[nodes]
+		total = int(counts.sum())
+		if not total:
+			return np.zeros(0, dtype=np.int64)
+		starts = np.repeat(offsets[nodes] - np.cumsum(counts) + counts, counts)
+		return starts + np.arange(total)
+
+	@staticmethod
+	def _select(shortest_paths: ShortestPaths, targets: Optional[Iterable[int]]) -> ShortestPaths:
+		# with targets, unsettled nodes only hold tentative distances so they are left out
+		if targets is None:
+			return shortest_paths
+		return shortest_paths.subset(targets)
+
+class BellmanFordSolver(ShortestPathSolver):
+	_engines = {Engine.PYTHON: None, Engine.QUEUE: None, Engine.NUMPY: (InputType.ADJACENCY_MATRIX,)}
+
 	def __init__(self):
 		self.graph = None
 		self.input_type = None
+		self.engine = Engine.PYTHON
+		self._matrix = None
 
 	def set_graph(self, graph):
+		self._graph_changed()
 		self.graph = graph
 
 	def set_input_type(self, input_type):
 		self.input_type = input_type
-		
+		self._matrix = None
+
+	def set_engine(self, engine: Engine):
+		self._check_engine(engine)
+		self.engine = engine
+
+	def _graph_edited(self):
+		super()._graph_edited()
+		self._matrix = None
+
 	def solve(self, start: int) -> dict:
+		self._track(start)
+		with self._phase('solve'):
+			if self.cache is not None:
+				return self._cached(lambda: self._solve(start), start)
+			return self._solve(start)
+		
+	def _solve(self, start: int) -> dict:
 		if not self.input_type:
 			raise ValueError("An input type must be set first")
-		if not self.graph:
+		if self.graph is None or not len(self.graph):
 			raise ValueError("No graph exists")
+		self._check_engine(self.engine)
+		if self.engine == Engine.QUEUE:
+			return self._solve_queue(start)
 		match self.input_type:
 			case InputType.DICTIONARY:
-				shortest_paths = {}
-				for node in self.graph:
-					shortest_paths[node]=math.inf
-				shortest_paths[start] = 0
+				shortest_paths = ShortestPaths.tree(self.graph, start, max(self.graph) + 1)
+				predecessors = shortest_paths.predecessors
 
 				size = len(self.graph)
+				relaxed = 0
+
+				with self._phase('relax'):
+					for i in range(size-1):
+						for node in self.graph:
+							relaxed += len(self.graph[node])
+							for cost, to_node in self.graph[node]:
+								if shortest_paths[node] + cost < shortest_paths[to_node]:
+									shortest_paths[to_node] = shortest_paths[node] + cost
+									predecessors[to_node] = node
+				self._count('edge_relaxations', relaxed)
 
-				for i in range(size-1):
+				with self._phase('negative_cycle_check'):
 					for node in self.graph:
 						for cost, to_node in self.graph[node]:
 							if shortest_paths[node] + cost < shortest_paths[to_node]:
-								shortest_paths[to_node] = shortest_paths[node] + cost
-
-				for node in self.graph:
-					for cost, to_node in self.graph[node]:
-						if shortest_paths[node] + cost < shortest_paths[to_node]:
-							raise ValueError('Invalid input - negative cycle detected')
+								raise ValueError('Invalid input - negative cycle detected')
 
 				return shortest_paths
 			
 			case InputType.ADJACENCY_MATRIX:
+				if self.engine == Engine.NUMPY:
+					return self._solve_matrix_numpy(start)
+
 				n = len(self.graph)
-				shortest_paths = {i:math.inf for i in range(n)}
-				shortest_paths[start] = 0
+				shortest_paths = ShortestPaths.tree(range(n), start, n)
+				predecessors = shortest_paths.predecessors
+				relaxed = 0
+
+				with self._phase('relax'):
+					for i in range(n-1):
+						for node in range(n):
+							for nxt, cost in enumerate(self.graph[node]):
+								if cost == 0:
+									continue
+								relaxed += 1
+								if shortest_paths[node] + cost < shortest_paths[nxt]:
+									shortest_paths[nxt] = shortest_paths[node] + cost
+									predecessors[nxt] = node
+				self._count('edge_relaxations', relaxed)
 
-				for i in range(n-1):
+				with self._phase('negative_cycle_check'):
 					for node in range(n):
 						for nxt, cost in enumerate(self.graph[node]):
 							if cost != 0 and shortest_paths[node] + cost < shortest_paths[nxt]:
-								shortest_paths[nxt] = shortest_paths[node] + cost
+								raise ValueError('Invalid input - negative cycle detected')
+
+				return shortest_paths
+			case InputType.CSR:
+				offsets, targets, weights = self.graph.offsets, self.graph.targets, self.graph.weights
+				n = self.graph.n_nodes
+				shortest_paths = ShortestPaths.tree(range(n), start, n)
+				predecessors = shortest_paths.predecessors
+				relaxed = 0
+
+				with self._phase('relax'):
+					for i in range(n-1):
+						for node in range(n):
+							relaxed += offsets[node+1] - offsets[node]
+							for j in range(offsets[node], offsets[node+1]):
+								if shortest_paths[node] + weights[j] < shortest_paths[targets[j]]:
+									shortest_paths[targets[j]] = shortest_paths[node] + weights[j]
+									predecessors[targets[j]] = node
+				self._count('edge_relaxations', relaxed)
 
-				for node in range(n):
-					for nxt, cost in enumerate(self.graph[node]):
-						if cost != 0 and shortest_paths[node] + cost < shortest_paths[nxt]:
-							raise ValueError('Invalid input - negative cycle detected')
+				with self._phase('negative_cycle_check'):
+					for node in range(n):
+						for j in range(offsets[node], offsets[node+1]):
+							if shortest_paths[node] + weights[j] < shortest_paths[targets[j]]:
+								raise ValueError('Invalid input - negative cycle detected')
 
 				return shortest_paths
 			case _:
 				raise ValueError("Invalid input type")
+
+	def _solve_queue(self, start: int) -> dict:
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		n = len(nodes)
+		shortest_paths = ShortestPaths.tree(nodes, start, max(nodes) + 1)
+		predecessor = shortest_paths.predecessors
+		# number of edges on the current best path; reaching n means the path repeats a vertex
+		hops = {start: 0}
+
+		queue = deque([start])
+		queued = {start}
+		enqueue, dequeue = self._counted(queue.append, 'queue_pushes'), self._counted(queue.popleft, 'queue_pops')
+		relaxed = 0
+
+		while queue:
+			node = dequeue()
+			queued.discard(node)
+			distance = shortest_paths[node]
+			for cost, to_node in neighbors(node):
+				relaxed += 1
+				if distance + cost < shortest_paths[to_node]:
+					shortest_paths[to_node] = distance + cost
+					predecessor[to_node] = node
+					hops[to_node] = hops[node] + 1
+					if hops[to_node] >= n:
+						raise NegativeCycleError(self._trace_cycle(predecessor, to_node, n))
+					if to_node not in queued:
+						queued.add(to_node)
+						enqueue(to_node)
+
+		self._count('edge_relaxations', relaxed)
+		return shortest_paths
+
+	def _propagate(self, distances: dict, predecessors: dict, seeds: list, neighbors):
+		limit = len(distances)
+		queue, queued = deque(seeds), set(seeds)
+		relaxed = {}
+		while queue:
+			node = queue.popleft()
+			queued.discard(node)
+			distance = distances[node]
+			for cost, to_node in neighbors(node):
+				if distance + cost < distances.get(to_node, math.inf):
+					distances[to_node] = distance + cost
+					predecessors[to_node] = node
+					relaxed[to_node] = relaxed.get(to_node, 0) + 1
+					if relaxed[to_node] > limit:
+						raise ValueError('Invalid input - negative cycle detected')
+					if to_node not in queued:
+						queued.add(to_node)
+						queue.append(to_node)
+
+	@staticmethod
+	def _trace_cycle(predecessor: array, node: int, n: int) -> list:
+		# walking back n steps from a vertex whose path is too long always lands on the cycle
+		for _ in range(n):
+			node = predecessor[node]
+		cycle = [node]
+		current = predecessor[node]
+		while current != node:
+			cycle.append(current)
+			current = predecessor[current]
+		cycle.reverse()
+		return cycle
+
+	def _solve_matrix_numpy(self, start: int) -> dict:
+		if self._matrix is None:
+			# 0 marks a missing edge in the matrix layout, same as the python loops; always a copy, never the caller's matrix
+			matrix = np.array(self.graph, dtype=np.float64)
+			matrix[matrix == 0] = np.inf
+			self._matrix = matrix
+		matrix = self._matrix
+		n = len(matrix)
+
+		dist = np.full(n, np.inf)
+		dist[start] = 0
+		pred = np.full(n, -1, dtype=np.int64)
+		columns = np.arange(n)
+
+		# each round relaxes every edge at once: dist[v] = min(dist[v], min_u dist[u] + w(u, v))
+		for i in range(n):
+			self._count('rounds')
+			candidates = dist[:, None] + matrix
+			best = candidates.argmin(axis=0)
+			improved = candidates[best, columns] < dist
+			if not improved.any():
+				break
+			if i == n-1:
+				raise ValueError('Invalid input - negative cycle detected')
+			dist = np.where(improved, candidates[best, columns], dist)
+			pred[improved] = best[improved]
+
+		return ShortestPaths.from_arrays(start, columns, dist, pred)
 			
-class KruskalSolver(Solver):
+class KruskalSolver(SpanningTreeSolver):
+	# record layout for spilled external-sort runs: (cost, node1, node2)
+	_RUN_RECORD = struct.Struct('dqq')
+
 	def __init__(self):
 		self.graph = None
 		self.input_type = None
 
 	def set_graph(self, graph):
+		self._graph_changed()
 		self.graph = graph
 
 	def set_input_type(self, input_type):
@@ -151,75 +1118,239 @@ class KruskalSolver(Solver):
 		assert self.graph is not None
 		match self.input_type:
 			case InputType.DICTIONARY:
-				total_cost = 0
-				MST = []
-				n_nodes = 0
+				n = len(self.graph)
+				# every undirected edge is normalised to (cost, low, high) so both copies pop together
+				edges = [
+					(item[0], min(item[1], node), max(item[1], node))
+					for node, items in self.graph.items()
+					for item in items
+				]
+			
+			case InputType.ADJACENCY_MATRIX:
+				n = len(self.graph)
 				edges = []
+				for i in range(n):
+					row = self.graph[i]
+					for j in range(i+1, n):
+						cost = row[j]
+						if cost == 0 or cost == math.inf:
+							cost = self.graph[j][i]
+						if cost != 0 and cost != math.inf:
+							edges.append((cost, i, j))
 
-				for _, item in self.graph.items():
-					n_nodes += 1
-					edges.extend(item)
+			case InputType.CSR:
+				n = self.graph.n_nodes
+				edges = [(cost, min(n1, n2), max(n1, n2)) for cost, n1, n2 in self.graph.edges()]
+			
+			case _:
+				raise ValueError("Invalid input type")
 
-				edges.sort()
+		# heapify is O(E) and only the edges popped before the tree is complete pay log E
+		with self._phase('heapify'):
+			heapq.heapify(edges)
+		pop = self._counted(heapq.heappop, 'heap_pops')
+		return self._remember(self._build_mst((pop(edges) for _ in range(len(edges))), n))
 
-				uf = UnionFind(n_nodes)
+	def solve_stream(self, edges: Iterable[tuple], n_nodes: int, presorted: bool = False, chunk_size: int = 1_000_000) -> list:
+		self._forest = None
+		if not presorted:
+			edges = self._external_sort(edges, chunk_size)
+		return self._build_mst(edges, n_nodes)
 
-				for cost, node1, node2 in edges:
-					if uf.find(node1) != uf.find(node2):
-						total_cost += cost
-						uf.union(node1, node2)
-						MST.append((cost, node1, node2)) 
+	def _build_mst(self, sorted_edges: Iterable[tuple], n_nodes: int) -> list:
+		uf = self._union_find(n_nodes)
+		union = self._counted(uf.union, 'unions')
+		MST, total_cost = [], 0
+		previous = None
 
-				print(f"Minimum cost: {total_cost}")
-				return MST
-			
-			case InputType.ADJACENCY_MATRIX:
-				res = 0
-				MST = []
-				n = len(self.graph)
-				uf = UnionFind(n)
+		with self._phase('build'):
+			for edge in sorted_edges:
+				if len(MST) >= n_nodes - 1:
+					break
+				if edge == previous:
+					continue
+				previous = edge
+				if union(edge[1], edge[2]):
+					total_cost += edge[0]
+					MST.append(edge)
 
-				edges = [(self.graph[i][j], i, j) for j in range(n) for i in range(n) if self.graph[i][j] != 0 and self.graph[i][j] != math.inf]
+		self._record('total_cost', total_cost)
+		return MST
 
-				edges.sort()
+	def _external_sort(self, edges: Iterable[tuple], chunk_size: int) -> Iterator[tuple]:
+		runs, chunk = [], []
+		for cost, n1, n2 in edges:
+			chunk.append((cost, min(n1, n2), max(n1, n2)))
+			if len(chunk) >= chunk_size:
+				runs.append(self._spill(chunk))
+				chunk = []
 
-				for cost, n1, n2 in edges:
-					if uf.find(n1) != uf.find(n2):
-						res += cost
-						uf.union(n1,n2)
-						MST.append((cost, n1, n2))
+		if not runs:
+			chunk.sort()
+			yield from chunk
+			return
+		if chunk:
+			runs.append(self._spill(chunk))
 
-				print(f"Minimum cost: {res}")
-				return MST
+		try:
+			yield from heapq.merge(*(self._read_run(run) for run in runs))
+		finally:
+			for run in runs:
+				run.close()
+
+	@classmethod
+	def _spill(cls, chunk: list):
+		chunk.sort()
+		run = tempfile.TemporaryFile()
+		pack = cls._RUN_RECORD.pack
+		run.write(b''.join(pack(*edge) for edge in chunk))
+		run.seek(0)
+		return run
+
+	@classmethod
+	def _read_run(cls, run, records_per_read: int = 65536) -> Iterator[tuple]:
+		record = cls._RUN_RECORD
+		while True:
+			block = run.read(record.size * records_per_read)
+			if not block:
+				return
+			for cost, n1, n2 in record.iter_unpack(block):
+				yield (int(cost) if cost.is_integer() else cost), n1, n2
 			
+class BoruvkaSolver(SpanningTreeSolver):
+	def __init__(self):
+		self.graph = None
+		self.input_type = None
+
+	def set_graph(self, graph):
+		self._graph_changed()
+		self.graph = graph
+
+	def set_input_type(self, input_type):
+		self.input_type = input_type
+
+	def solve(self, start: int) -> list:
+		assert self.input_type is not None
+		assert self.graph is not None
+		with self._phase('edges'):
+			n, low, high, costs = self._edge_arrays()
+		with self._phase('rounds'):
+			MST = self._solve(n, low, high, costs)
+		self._record('total_cost', sum(edge[0] for edge in MST))
+		return self._remember(MST)
+
+	def _edge_arrays(self) -> tuple:
+		# every undirected edge as (low, high, cost) arrays; duplicates are harmless, self loops are dropped
+		match self.input_type:
+			case InputType.DICTIONARY:
+				sources = [node for node, items in self.graph.items() for _ in items]
+				targets = [item[1] for items in self.graph.values() for item in items]
+				costs = np.asarray([item[0] for items in self.graph.values() for item in items])
+				n = max(max(self.graph, default=-1), max(targets, default=-1)) + 1
+				sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+			case InputType.ADJACENCY_MATRIX:
+				matrix = np.asarray(self.graph)
+				n = len(matrix)
+				sources, targets = np.nonzero((matrix != 0) & (matrix != np.inf))
+				costs = matrix[sources, targets]
+			case InputType.CSR:
+				n = self.graph.n_nodes
+				offsets = np.asarray(self.graph.offsets, dtype=np.int64)
+				sources = np.repeat(np.arange(n), np.diff(offsets))
+				targets = np.asarray(self.graph.targets, dtype=np.int64)
+				costs = np.asarray(self.graph.weights)
 			case _:
 				raise ValueError("Invalid input type")
-			
-class PrimsSolver(Solver):
+
+		if costs.dtype.kind == 'f' and np.all(np.mod(costs, 1) == 0):
+			costs = costs.astype(np.int64)
+		keep = sources != targets
+		low, high = np.minimum(sources, targets)[keep], np.maximum(sources, targets)[keep]
+		return n, low, high, costs[keep]
+
+	def _solve(self, n: int, low, high, costs) -> list:
+		# a stable sort by cost gives every edge a unique rank, so ties can never close a cycle
+		order = np.argsort(costs, kind='stable')
+		low, high, costs = low[order], high[order], costs[order]
+		uf = self._union_find(n)
+		union = self._counted(uf.union, 'unions')
+		MST = []
+
+		while len(costs):
+			self._count('rounds')
+			root_low, root_high = uf.find_many(low), uf.find_many(high)
+			self._count('finds', 2 * len(low))
+			crossing = root_low != root_high
+			# edges inside a component stay inside it, so each round only keeps the crossing ones
+			low, high, costs = low[crossing], high[crossing], costs[crossing]
+			root_low, root_high = root_low[crossing], root_high[crossing]
+			if not len(costs):
+				break
+
+			# cheapest outgoing edge of every component in one vectorised pass; positions follow the sorted order
+			m = len(costs)
+			cheapest = np.full(n, m, dtype=np.int64)
+			np.minimum.at(cheapest, root_low, np.arange(m))
+			np.minimum.at(cheapest, root_high, np.arange(m))
+			for i in np.unique(cheapest[cheapest < m]).tolist():
+				if union(int(low[i]), int(high[i])):
+					MST.append((costs[i].item(), int(low[i]), int(high[i])))
+
+		MST.sort()
+		return MST
+
+class PrimsSolver(SpanningTreeSolver):
+	_engines = {Engine.PYTHON: None, Engine.INDEXED_HEAP: None,
+		Engine.ARRAY: (InputType.ADJACENCY_MATRIX,), Engine.NUMPY: (InputType.ADJACENCY_MATRIX,)}
+
 	def __init__(self):
 		self.graph = None
 		self.input_type = None
+		self.engine = Engine.PYTHON
+		self._matrix = None
 
 	def set_graph(self, graph):
+		self._graph_changed()
 		self.graph = graph
+		self._matrix = None
 
 	def set_input_type(self, input_type):
 		self.input_type = input_type
+		self._matrix = None
+
+	def set_engine(self, engine: Engine):
+		self._check_engine(engine)
+		self.engine = engine
+
+	def _graph_edited(self):
+		super()._graph_edited()
+		self._matrix = None
 		
 	def solve(self, start: int) -> list:
+		with self._phase('solve'):
+			MST = self._solve(start)
+		self._record('total_cost', sum(edge[0] for edge in MST))
+		self._root = start
+		return self._remember(MST)
+
+	def _solve(self, start: int) -> list:
 		assert self.input_type is not None
 		assert self.graph is not None
+		self._check_engine(self.engine)
+		if self.engine == Engine.INDEXED_HEAP:
+			return self._solve_indexed(start)
+		push, pop = self._counted(heapq.heappush, 'heap_pushes'), self._counted(heapq.heappop, 'heap_pops')
 		match self.input_type:
 			case InputType.DICTIONARY:
 				seen, unseen = set(), set(list(self.graph.keys()))
-				heap = self.graph[start]
+				heap = list(self.graph[start])
 				heapq.heapify(heap)
 				seen.add(start)
 				unseen.remove(start)
 				MST, total_cost = [], 0
 
-				while unseen:
-					cost, from_node, to_node = heapq.heappop(heap)
+				while unseen and heap:
+					cost, from_node, to_node = pop(heap)
 					new_node = None
 
 					if from_node in seen and to_node in unseen:
@@ -229,26 +1360,31 @@ class PrimsSolver(Solver):
 						new_node = from_node
 						MST.append((cost, from_node, to_node))
 
-					if new_node:
+					if new_node is not None:
 						seen.add(new_node)
 						unseen.remove(new_node)
 						total_cost += cost
 						for nxt in self.graph[new_node]:
-							heapq.heappush(heap, nxt)
+							push(heap, nxt)
 
-				print(total_cost)
 				return MST
 			
 			case InputType.ADJACENCY_MATRIX:
+				match self.engine:
+					case Engine.ARRAY:
+						return self._solve_dense(start)
+					case Engine.NUMPY:
+						return self._solve_dense_numpy(start)
+
 				seen, unseen = set(), set(list(range(len(self.graph))))
-				heap = [(cost, to, start) for to, cost in enumerate(self.graph[start])]
+				heap = [(cost, to, start) for to, cost in enumerate(self.graph[start]) if cost != 0 and cost != math.inf]
 				heapq.heapify(heap)
 				seen.add(start)
 				unseen.remove(start)
 				MST, total_cost = [], 0
 
-				while unseen:
-					cost, from_node, to_node = heapq.heappop(heap)
+				while unseen and heap:
+					cost, from_node, to_node = pop(heap)
 					new_node = None
 					if from_node in seen and to_node in unseen:
 						new_node = to_node
@@ -257,17 +1393,501 @@ class PrimsSolver(Solver):
 						new_node = from_node
 						MST.append((cost, from_node, to_node))
 
-					if new_node:
+					if new_node is not None:
 						seen.add(new_node)
 						unseen.remove(new_node)
 						total_cost += cost
 
 						for nxt, cost in enumerate(self.graph[new_node]):
 							if cost != 0 and cost != math.inf:
-								heapq.heappush(heap, (cost, nxt, new_node))
-				
-				print(total_cost)
+								push(heap, (cost, nxt, new_node))
+				return MST
+
+			case InputType.CSR:
+				offsets, targets, weights = self.graph.offsets, self.graph.targets, self.graph.weights
+				seen, unseen = set(), set(range(self.graph.n_nodes))
+				heap = [(weights[i], targets[i], start) for i in range(offsets[start], offsets[start+1])]
+				heapq.heapify(heap)
+				seen.add(start)
+				unseen.remove(start)
+				MST, total_cost = [], 0
+
+				while unseen and heap:
+					cost, from_node, to_node = pop(heap)
+					new_node = None
+					if from_node in seen and to_node in unseen:
+						new_node = to_node
+						MST.append((cost, from_node, to_node))
+					elif to_node in seen and from_node in unseen:
+						new_node = from_node
+						MST.append((cost, from_node, to_node))
+
+					if new_node is not None:
+						seen.add(new_node)
+						unseen.remove(new_node)
+						total_cost += cost
+
+						for i in range(offsets[new_node], offsets[new_node+1]):
+							push(heap, (weights[i], targets[i], new_node))
+
 				return MST
 			
 			case _:
-				raise ValueError("Invalid input type")
\ No newline at end of file
+				raise ValueError("Invalid input type")
+
+	def _solve_indexed(self, start: int) -> list:
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		size = max(nodes) + 1
+		parent = array('q', [-1]) * size
+		in_tree = bytearray(size)
+		heap = IndexedHeap(size)
+		push, pop = self._counted(heap.push, 'heap_pushes'), self._counted(heap.pop, 'heap_pops')
+		decrease_key = self._counted(heap.decrease_key, 'decrease_keys')
+		push(start, 0)
+		MST = []
+
+		while heap:
+			cost, node = pop()
+			in_tree[node] = 1
+			if node != start:
+				MST.append((cost, node, parent[node]))
+
+			for w, nxt in neighbors(node):
+				if in_tree[nxt]:
+					continue
+				if nxt not in heap:
+					parent[nxt] = node
+					push(nxt, w)
+				elif w < heap.key[nxt] or (w == heap.key[nxt] and node < parent[nxt]):
+					parent[nxt] = node
+					decrease_key(nxt, w)
+
+		return MST
+
+	def _solve_dense(self, start: int) -> list:
+		graph = self.graph
+		n = len(graph)
+		key, parent, in_tree = [math.inf] * n, [-1] * n, [False] * n
+		key[start] = 0
+		MST = []
+
+		for _ in range(n):
+			# ties go to the lowest node, then the lowest parent, matching the heap ordering
+			cost, node = min((key[v], v) for v in range(n) if not in_tree[v])
+			if cost == math.inf:
+				break
+			in_tree[node] = True
+			if node != start:
+				MST.append((cost, node, parent[node]))
+
+			row = graph[node]
+			for v in range(n):
+				w = row[v]
+				if not in_tree[v] and w != 0 and w != math.inf and (w < key[v] or (w == key[v] and node < parent[v])):
+					key[v] = w
+					parent[v] = node
+
+		return MST
+
+	def _solve_dense_numpy(self, start: int) -> list:
+		if self._matrix is None:
+			matrix = np.array(self.graph, dtype=np.float64)
+			matrix[matrix == 0] = np.inf
+			self._matrix = matrix
+		matrix = self._matrix
+		n = len(matrix)
+
+		key = np.full(n, np.inf)
+		parent = np.full(n, -1, dtype=np.int64)
+		in_tree = np.zeros(n, dtype=bool)
+		key[start] = 0
+		MST = []
+
+		for _ in range(n):
+			# tree nodes keep an infinite key, so argmin only ever lands on them once the rest is unreachable
+			node = int(key.argmin())
+			if key[node] == np.inf:
+				break
+			in_tree[node] = True
+			key[node] = np.inf
+			if node != start:
+				from_node = int(parent[node])
+				MST.append((self.graph[from_node][node], node, from_node))
+
+			row = matrix[node]
+			better = ~in_tree & ((row < key) | ((row == key) & (row != np.inf) & (node < parent)))
+			key[better] = row[better]
+			parent[better] = node
+
+		return MST
+
+class KahnsSolver(Solver):
+	def __init__(self):
+		self.graph = None
+		self.input_type = None
+
+	def set_graph(self, graph):
+		self.graph = graph
+
+	def set_input_type(self, input_type):
+		self.input_type = input_type
+
+	def sort(self) -> list:
+		if not self.input_type:
+			raise ValueError("An input type must be set first")
+		if self.graph is None or not len(self.graph):
+			raise ValueError("No graph exists")
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		indegree = dict.fromkeys(nodes, 0)
+		for node in nodes:
+			for _, to_node in neighbors(node):
+				indegree[to_node] += 1
+
+		queue = deque(node for node in nodes if indegree[node] == 0)
+		order = []
+		while queue:
+			node = queue.popleft()
+			order.append(node)
+			for _, to_node in neighbors(node):
+				indegree[to_node] -= 1
+				if indegree[to_node] == 0:
+					queue.append(to_node)
+
+		if len(order) != len(indegree):
+			raise ValueError('Invalid input - cycle detected')
+		return order
+
+	def solve(self, start: int, longest: bool = False) -> dict:
+		order = self.sort()
+		_, neighbors = adjacency(self.graph, self.input_type)
+		# longest paths are shortest paths over negated costs
+		sign = -1 if longest else 1
+		shortest_paths = dict.fromkeys(order, math.inf)
+		shortest_paths[start] = 0
+
+		# every predecessor of a node is final before the node itself is expanded
+		for node in order[order.index(start):]:
+			distance = shortest_paths[node]
+			if distance == math.inf:
+				continue
+			for cost, to_node in neighbors(node):
+				if distance + sign * cost < shortest_paths[to_node]:
+					shortest_paths[to_node] = distance + sign * cost
+
+		return {node: sign * distance for node, distance in shortest_paths.items()} if longest else shortest_paths
+
+class ComponentsSolver(Solver):
+	def __init__(self):
+		self.graph = None
+		self.input_type = None
+
+	def set_graph(self, graph):
+		self.graph = graph
+
+	def set_input_type(self, input_type):
+		self.input_type = input_type
+
+	def solve(self, start: Optional[int] = None) -> list:
+		# connected components ignoring edge direction; with a start, only the component holding it
+		if not self.input_type:
+			raise ValueError("An input type must be set first")
+		if self.graph is None or not len(self.graph):
+			raise ValueError("No graph exists")
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		uf = self._union_find(max(nodes) + 1)
+		union = self._counted(uf.union, 'unions')
+		for node in nodes:
+			for _, to_node in neighbors(node):
+				union(node, to_node)
+
+		find = uf.find
+		if start is not None:
+			root = find(start)
+			return [node for node in nodes if find(node) == root]
+		components = {}
+		for node in nodes:
+			components.setdefault(find(node), []).append(node)
+		return sorted(components.values())
+
+class StronglyConnectedSolver(Solver):
+	def __init__(self):
+		self.graph = None
+		self.input_type = None
+
+	def set_graph(self, graph):
+		self.graph = graph
+
+	def set_input_type(self, input_type):
+		self.input_type = input_type
+
+	def solve(self, start: Optional[int] = None) -> list:
+		# Tarjan with an explicit stack of (node, edge iterator) frames; components come out sinks first
+		# with a start, only the components reachable from it are visited
+		if not self.input_type:
+			raise ValueError("An input type must be set first")
+		if self.graph is None or not len(self.graph):
+			raise ValueError("No graph exists")
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		size = max(nodes) + 1
+		index = array('q', [-1]) * size
+		low = array('q', bytes(8 * size))
+		on_stack = bytearray(size)
+		stack, components = [], []
+		counter = 0
+
+		for root in (nodes if start is None else [start]):
+			if index[root] >= 0:
+				continue
+			index[root] = low[root] = counter
+			counter += 1
+			stack.append(root)
+			on_stack[root] = 1
+			frames = [(root, iter(neighbors(root)))]
+			while frames:
+				node, edges = frames[-1]
+				for _, to_node in edges:
+					if index[to_node] < 0:
+						index[to_node] = low[to_node] = counter
+						counter += 1
+						stack.append(to_node)
+						on_stack[to_node] = 1
+						frames.append((to_node, iter(neighbors(to_node))))
+						break
+					if on_stack[to_node] and index[to_node] < low[node]:
+						low[node] = index[to_node]
+				else:
+					frames.pop()
+					if frames and low[node] < low[frames[-1][0]]:
+						low[frames[-1][0]] = low[node]
+					if low[node] == index[node]:
+						component = []
+						while True:
+							member = stack.pop()
+							on_stack[member] = 0
+							component.append(member)
+							if member == node:
+								break
+						components.append(sorted(component))
+
+		return components
+
+class BridgesSolver(Solver):
+	def __init__(self):
+		self.graph = None
+		self.input_type = None
+		self._analysis = None
+
+	def set_graph(self, graph):
+		self.graph = graph
+		self._analysis = None
+
+	def set_input_type(self, input_type):
+		self.input_type = input_type
+		self._analysis = None
+
+	def solve(self, start: Optional[int] = None) -> list:
+		# bridges as (low, high) pairs of the undirected graph
+		return self._analyse()[0]
+
+	def articulation_points(self) -> list:
+		return self._analyse()[1]
+
+	def _analyse(self) -> tuple:
+		if not self.input_type:
+			raise ValueError("An input type must be set first")
+		if self.graph is None or not len(self.graph):
+			raise ValueError("No graph exists")
+		if self._analysis is not None:
+			return self._analysis
+
+		# both directions of an edge collapse into one undirected edge; the DFS skips its parent by edge id
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		size = max(nodes) + 1
+		pairs = {(min(node, to_node), max(node, to_node)) for node in nodes for _, to_node in neighbors(node) if node != to_node}
+		size = max(size, max((high for _, high in pairs), default=-1) + 1)
+		incident = [[] for _ in range(size)]
+		pairs = sorted(pairs)
+		for edge, (node1, node2) in enumerate(pairs):
+			incident[node1].append((node2, edge))
+			incident[node2].append((node1, edge))
+
+		order = array('q', [-1]) * size
+		low = array('q', bytes(8 * size))
+		bridges, points = [], set()
+		counter = 0
+		for root in range(size):
+			if order[root] >= 0 or not incident[root]:
+				continue
+			order[root] = low[root] = counter
+			counter += 1
+			children = 0
+			frames = [(root, -1, iter(incident[root]))]
+			while frames:
+				node, via, edges = frames[-1]
+				for to_node, edge in edges:
+					if edge == via:
+						continue
+					if order[to_node] < 0:
+						order[to_node] = low[to_node] = counter
+						counter += 1
+						if node == root:
+							children += 1
+						frames.append((to_node, edge, iter(incident[to_node])))
+						break
+					if order[to_node] < low[node]:
+						low[node] = order[to_node]
+				else:
+					frames.pop()
+					if not frames:
+						continue
+					parent = frames[-1][0]
+					if low[node] < low[parent]:
+						low[parent] = low[node]
+					if low[node] > order[parent]:
+						bridges.append(pairs[via])
+					if parent != root and low[node] >= order[parent]:
+						points.add(parent)
+			if children > 1:
+				points.add(root)
+
+		self._analysis = (sorted(bridges), sorted(points))
+		return self._analysis
+
+class FloydWarshallSolver(Solver):
+	_engines = {Engine.NUMPY: None, Engine.JOHNSON: None}
+
+	def __init__(self, block_size: int = 128):
+		self.graph = None
+		self.input_type = None
+		self.engine = Engine.NUMPY
+		self.track_predecessors = False
+		self.block_size = block_size
+		self._distances = None
+		self._predecessors = None
+
+	def set_graph(self, graph):
+		self.graph = graph
+		self._distances = self._predecessors = None
+
+	def set_input_type(self, input_type):
+		self.input_type = input_type
+		self._distances = self._predecessors = None
+
+	def set_engine(self, engine: Engine):
+		self._check_engine(engine)
+		self.engine = engine
+		self._distances = self._predecessors = None
+
+	def set_predecessors(self, track: bool):
+		self.track_predecessors = track
+		self._distances = self._predecessors = None
+
+	def restore(self, distances: np.ndarray, predecessors: Optional[np.ndarray] = None):
+		# tables saved from an earlier solve_all of the same graph, e.g. snapshot.load_all_pairs
+		self._distances, self._predecessors = distances, predecessors
+		self.track_predecessors = predecessors is not None
+
+	def solve(self, start: int) -> dict:
+		return dict(enumerate(self.solve_all()[start].tolist()))
+
+	def solve_all(self) -> np.ndarray:
+		if not self.input_type:
+			raise ValueError("An input type must be set first")
+		if self.graph is None or not len(self.graph):
+			raise ValueError("No graph exists")
+		if self._distances is None:
+			match self.engine:
+				case Engine.NUMPY:
+					self._solve_blocked()
+				case Engine.JOHNSON:
+					self._solve_johnson()
+				case _:
+					raise ValueError("Invalid engine")
+		return self._distances
+
+	def predecessors(self) -> np.ndarray:
+		if not self.track_predecessors:
+			raise ValueError("Predecessor tracking is disabled")
+		self.solve_all()
+		return self._predecessors
+
+	def path(self, start: int, end: int) -> list:
+		predecessors = self.predecessors()
+		if self._distances[start, end] == np.inf:
+			return []
+		path = [end]
+		while end != start:
+			end = int(predecessors[start, end])
+			path.append(end)
+		path.reverse()
+		return path
+
+	def _weight_matrix(self) -> np.ndarray:
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		n = max(nodes) + 1
+		matrix = np.full((n, n), np.inf)
+		for node in nodes:
+			for cost, to_node in neighbors(node):
+				if cost < matrix[node, to_node]:
+					matrix[node, to_node] = cost
+		np.fill_diagonal(matrix, np.minimum(matrix.diagonal(), 0))
+		return matrix
+
+	def _solve_blocked(self):
+		dist = self._weight_matrix()
+		n = len(dist)
+		pred = None
+		if self.track_predecessors:
+			pred = np.where(dist < np.inf, np.arange(n)[:, None], -1)
+			np.fill_diagonal(pred, np.arange(n))
+
+		# per pivot block, the pivot rows are finished first; every other strip of rows then
+		# runs the block's pivots while staying resident in cache, reading the finished pivot rows
+		b = self.block_size
+		for k0 in range(0, n, b):
+			pivots = range(k0, min(k0 + b, n))
+			strips = [(k0, pivots.stop)] + [(r, min(r + b, n)) for r in range(0, n, b) if r != k0]
+			for lo, hi in strips:
+				strip = dist[lo:hi]
+				pred_strip = pred[lo:hi] if pred is not None else None
+				for k in pivots:
+					candidate = strip[:, k, None] + dist[k]
+					if pred_strip is None:
+						np.minimum(strip, candidate, out=strip)
+					else:
+						better = candidate < strip
+						strip[better] = candidate[better]
+						np.copyto(pred_strip, np.broadcast_to(pred[k], pred_strip.shape), where=better)
+
+		if (dist.diagonal() < 0).any():
+			raise ValueError('Invalid input - negative cycle detected')
+		self._distances, self._predecessors = dist, pred
+
+	def _solve_johnson(self):
+		if self.track_predecessors:
+			raise ValueError("Predecessors are only tracked by the Floyd-Warshall engine")
+		nodes, neighbors = adjacency(self.graph, self.input_type)
+		n = max(nodes) + 1
+		edges = {node: list(neighbors(node)) for node in range(n)}
+
+		# potentials from a virtual source joined to every vertex by a zero-cost edge
+		virtual = dict(edges)
+		virtual[n] = [(0, node) for node in range(n)]
+		bellman_ford = BellmanFordSolver()
+		bellman_ford.set_input_type(InputType.DICTIONARY)
+		bellman_ford.set_engine(Engine.QUEUE)
+		bellman_ford.set_graph(virtual)
+		h = bellman_ford.solve(n)
+
+		reweighted = {node: [(cost + h[node] - h[to_node], to_node) for cost, to_node in edges[node]] for node in range(n)}
+		dijkstra = DijkstraSolver()
+		dijkstra.set_input_type(InputType.DICTIONARY)
+		dijkstra.set_engine(Engine.INDEXED_HEAP)
+		dijkstra.set_graph(reweighted)
+
+		dist = np.full((n, n), np.inf)
+		for source in range(n):
+			for node, distance in dijkstra.solve(source).items():
+				if distance != math.inf:
+					dist[source, node] = distance - h[source] + h[node]
+		self._distances, self._predecessors = dist, None
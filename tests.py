@@ -1,8 +1,50 @@
+import asyncio
+import bench
 import graph_algorithms
 from graph_algorithms import AlgorithmsFactory
 import input_factory
-from input_factory import InputType, AlgorithmType
+from input_factory import InputType, AlgorithmType, CSRGraph, DijkstraInput, FileInputFactory, save_csr, save_matrix
+from input_factory import ErdosRenyiInput, BarabasiAlbertInput, GridInput, DagInput
+from solvers import Engine, NegativeCycleError, ShortestPaths, DijkstraSolver, BellmanFordSolver, KruskalSolver, BoruvkaSolver, PrimsSolver, KahnsSolver, FloydWarshallSolver, StronglyConnectedSolver, BridgesSolver, adjacency
+from heuristics import CoordinateHeuristic, LandmarkHeuristic
+from contraction import ContractionHierarchy
+import json
+import parallel
+import server
+import snapshot
+import math
+from utils import UnionFind, IndexedHeap, ResultCache, SolverStats
 import unittest
+import os
+import tempfile
+import numpy as np
+
+def check_incremental_forest(solver_type):
+    # random edit sequences with distinct costs, so the incremental forest must equal a fresh solve exactly
+    import random
+    rng = random.Random(7)
+    for _ in range(30):
+        n = rng.randint(3, 9)
+        p = solver_type()
+        p.set_input_type(InputType.DICTIONARY)
+        p.set_graph({node: [] for node in range(n)})
+        p.solve(0)
+        edges, costs = set(), iter(rng.sample(range(1, 1000), 60))
+        for _ in range(20):
+            node1, node2 = rng.sample(range(n), 2)
+            edge = (min(node1, node2), max(node1, node2))
+            if edge in edges and rng.random() < 0.5:
+                edges.discard(edge)
+                r = p.delete_edge(*edge)
+            elif edge in edges:
+                r = p.update_edge(*edge, next(costs))
+            else:
+                edges.add(edge)
+                r = p.insert_edge(*edge, next(costs))
+            fresh = solver_type()
+            fresh.set_input_type(InputType.DICTIONARY)
+            fresh.set_graph(p.graph)
+            assert set((edge[0], min(edge[1:]), max(edge[1:])) for edge in fresh.solve(0)) == r
 
 class DijkstraTests(unittest.TestCase):
     def test_output_type(self):
@@ -32,6 +74,169 @@ class DijkstraTests(unittest.TestCase):
         for k, v in r1.items():
             assert r2[k] == v
 
+    def test_csr_consistency(self):
+        d1 = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d1.set_input_type(InputType.DICTIONARY)
+        d1.generate_input()
+
+        d2 = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d2.set_input_type(InputType.CSR)
+        d2.generate_input()
+
+        r1, r2 = d1.solve(0), d2.solve(0)
+        for k, v in r1.items():
+            assert r2[k] == v
+
+    def test_targets_early_exit(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+            d.set_input_type(input_type)
+            d.generate_input()
+
+            full = d.solve(0)
+            r = d.solve(0, targets={3, 4})
+            assert r == {3: full[3], 4: full[4]}
+
+    def test_stats(self):
+        d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d.set_input_type(InputType.DICTIONARY)
+        d.generate_input()
+        expected = d.solve(0)
+
+        stats = SolverStats()
+        d.set_stats(stats)
+        assert d.solve(0) == expected
+        counters = stats.counters
+        assert counters['heap_pops'] == counters['heap_pushes'] > 0
+        assert counters['stale_pops'] == counters['heap_pops'] - len(expected)
+        # every edge leaving a settled node is relaxed exactly once
+        assert counters['edge_relaxations'] == sum(len(d.input[node]) for node in expected if expected[node] < math.inf)
+        assert stats.timings['solve'] > 0
+
+    def test_point_to_point(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            grid = GridInput(input_type, 64, 200, seed=3)
+            graph = grid.generate()
+            d = DijkstraSolver()
+            d.set_input_type(input_type)
+            d.set_graph(graph)
+            full = d.solve(0)
+
+            bidirectional = d.solve(0, 63)
+            d.set_heuristic(CoordinateHeuristic(grid.coordinates(), scale=grid.min_weight / math.sqrt(2)))
+            coordinates = d.solve(0, 63)
+            d.set_heuristic(LandmarkHeuristic(graph, input_type, count=3))
+            landmarks = d.solve(0, 63)
+            assert bidirectional == coordinates == landmarks == {63: full[63]}
+
+            # every point query carries its route, and the route costs what the distance says
+            _, neighbors = adjacency(graph, input_type)
+            for r in (bidirectional, coordinates, landmarks):
+                route = r.path(63)
+                assert route[0] == 0 and route[-1] == 63
+                assert sum(min(c for c, to in neighbors(u) if to == v) for u, v in zip(route, route[1:])) == full[63]
+            d.set_heuristic(None)
+            assert d.solve(5, 5).path(5) == [5]
+            # numpy integers are single targets as well, not iterables of them
+            assert d.solve(0, np.int64(63)) == bidirectional
+
+    def test_contraction_hierarchy(self):
+        for input_type in (InputType.DICTIONARY, InputType.CSR):
+            graph = ErdosRenyiInput(input_type, 60, 180, seed=5).generate()
+            d = DijkstraSolver()
+            d.set_input_type(input_type)
+            d.set_graph(graph)
+            full = d.solve(7)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'graph.ch')
+                ContractionHierarchy.build(graph, input_type).save(path)
+                hierarchy = ContractionHierarchy.load(path)
+                d.set_hierarchy(hierarchy)
+                for target in range(60):
+                    r = d.solve(7, target)
+                    assert r == {target: full[target]}
+                    route = hierarchy.path(7, target)
+                    assert r.path(target) == (route or [])
+                    if full[target] == math.inf:
+                        assert route is None
+                        continue
+                    _, neighbors = adjacency(graph, input_type)
+                    cost = sum(min(c for c, to in neighbors(u) if to == v) for u, v in zip(route, route[1:]))
+                    assert route[0] == 7 and route[-1] == target and cost == full[target]
+
+    def test_paths(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            graph = ErdosRenyiInput(input_type, 30, 90, seed=2).generate()
+            _, neighbors = adjacency(graph, input_type)
+            d = DijkstraSolver()
+            d.set_input_type(input_type)
+            d.set_graph(graph)
+            r = d.solve(0)
+            for target, distance in r.items():
+                route = r.path(target)
+                if distance == math.inf:
+                    assert route == []
+                    continue
+                cost = sum(min(c for c, to in neighbors(u) if to == v) for u, v in zip(route, route[1:]))
+                assert route[0] == 0 and route[-1] == target and cost == distance
+
+            restored = ShortestPaths.from_arrays(0, *r.to_arrays())
+            assert restored == r and all(restored.path(node) == r.path(node) for node in r)
+
+    def test_delta_stepping_engine(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            graph = GridInput(input_type, 100, 300, seed=4).generate()
+            d = DijkstraSolver()
+            d.set_input_type(input_type)
+            d.set_graph(graph)
+            expected = d.solve(0)
+
+            d.set_engine(Engine.DELTA_STEPPING)
+            for delta in (None, 5, 500):
+                d.set_delta(delta)
+                r = d.solve(0)
+                assert r == expected
+                assert all(r.path(node)[-1] == node for node in r if r[node] != math.inf)
+
+    def test_indexed_heap_engine(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            d1 = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+            d1.set_input_type(input_type)
+            d1.generate_input()
+
+            d2 = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+            d2.set_input_type(input_type)
+            d2.set_engine(Engine.INDEXED_HEAP)
+            d2.generate_input()
+
+            assert d1.solve(0) == d2.solve(0)
+            assert d1.solve(0, targets={3}) == d2.solve(0, targets={3})
+
+    def test_incremental_updates(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY):
+            d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+            d.set_input_type(input_type)
+            d.generate_input()
+            d.solve(0)
+
+            r = d.update_edge(0, 2, 10)
+            assert r == {0: 0, 1: 4, 2: 7, 3: 6, 4: 7}
+            r = d.insert_edge(0, 4, 1)
+            assert r == {0: 0, 1: 4, 2: 7, 3: 2, 4: 1}
+            r = d.delete_edge(0, 1)
+            assert r == {0: 0, 1: 11, 2: 10, 3: 2, 4: 1}
+            # edits update one tracked tree in place rather than copying it out each time
+            assert d.update_edge(0, 4, 2) is r and r[4] == 2
+            assert d.update_edge(0, 4, 1) is r
+
+            fresh = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+            fresh.set_input_type(input_type)
+            fresh.generate_input()
+            fresh._solver.set_graph(d.input)
+            expected = fresh.solve(0)
+            assert expected == r and all(r.path(node) == expected.path(node) for node in r)
+
 class BellmanFordTests(unittest.TestCase):
     def test_output_type(self):
         # adj matrix input case
@@ -61,6 +266,131 @@ class BellmanFordTests(unittest.TestCase):
         for k, v in r1.items():
             assert r2[k] == v
 
+    def test_csr_consistency(self):
+        b1 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b1.set_input_type(InputType.DICTIONARY)
+        b1.generate_input()
+
+        b2 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b2.set_input_type(InputType.CSR)
+        b2.generate_input()
+
+        r1, r2 = b1.solve(0), b2.solve(0)
+        for k, v in r1.items():
+            assert r2[k] == v
+
+    def test_numpy_engine(self):
+        b1 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b1.set_input_type(InputType.ADJACENCY_MATRIX)
+        b1.generate_input()
+
+        b2 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b2.set_input_type(InputType.ADJACENCY_MATRIX)
+        b2.set_engine(Engine.NUMPY)
+        b2.generate_input()
+
+        assert b1.solve(0) == b2.solve(0)
+
+        b2._solver.set_graph([[0, 1, 0], [0, 0, -3], [1, 0, 0]])
+        with self.assertRaises(ValueError):
+            b2.solve(0)
+
+    def test_unsupported_engines(self):
+        # the vectorised engines only read matrices, and other inputs must not quietly run the python loop
+        b = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b.set_input_type(InputType.DICTIONARY)
+        b.generate_input()
+        with self.assertRaises(ValueError):
+            b.set_engine(Engine.NUMPY)
+        b._solver.engine = Engine.NUMPY
+        with self.assertRaises(ValueError):
+            b.solve(0)
+
+        with self.assertRaises(ValueError):
+            DijkstraSolver().set_engine(Engine.NUMPY)
+        p = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+        p.set_input_type(InputType.CSR)
+        with self.assertRaises(ValueError):
+            p.set_engine(Engine.ARRAY)
+
+    def test_queue_engine(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            b1 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+            b1.set_input_type(input_type)
+            b1.generate_input()
+
+            b2 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+            b2.set_input_type(input_type)
+            b2.set_engine(Engine.QUEUE)
+            b2.generate_input()
+
+            assert b1.solve(0) == b2.solve(0)
+
+        b2 = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b2.set_input_type(InputType.DICTIONARY)
+        b2.set_engine(Engine.QUEUE)
+        b2.generate_input()
+        b2._solver.set_graph({0: [(1, 1)], 1: [(-3, 2)], 2: [(1, 3)], 3: [(1, 1)]})
+        with self.assertRaises(NegativeCycleError) as ctx:
+            b2.solve(0)
+        assert sorted(ctx.exception.cycle) == [1, 2, 3]
+
+    def test_solve_many(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY):
+            b = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+            b.set_input_type(input_type)
+            b.set_engine(Engine.QUEUE)
+            b.generate_input()
+
+            starts = list(range(6)) * 3
+            assert b.solve_many(starts, workers=2) == [b.solve(start) for start in starts]
+
+        # non-contiguous keys: the shared CSR copy pads the gaps, results must not
+        d = DijkstraSolver()
+        d.set_input_type(InputType.DICTIONARY)
+        d.set_graph({0: [(2, 5)], 5: [(1, 9)], 9: [(4, 0)]})
+        r = parallel.solve_many(d, [0, 5, 9], workers=2)
+        assert r == [d.solve(start) for start in (0, 5, 9)] and set(r[0]) == {0, 5, 9}
+        assert r[0].path(9) == [0, 5, 9]
+
+    def test_stats(self):
+        graph = {0: [(4, 1), (1, 2)], 1: [(2, 1), (3, 3)], 2: [(-2, 1)], 3: []}
+        for engine in (Engine.PYTHON, Engine.QUEUE):
+            b = BellmanFordSolver()
+            b.set_input_type(InputType.DICTIONARY)
+            b.set_graph(graph)
+            b.set_engine(engine)
+            stats = SolverStats()
+            b.set_stats(stats)
+            assert b.solve(0)[3] == 2
+            relaxed = stats.counters['edge_relaxations']
+            # the queue only rescans nodes whose distance dropped, the plain rounds scan every edge each time
+            assert relaxed == 3 * 5 if engine == Engine.PYTHON else 5 <= relaxed < 3 * 5
+
+    def test_solve_many_keeps_configuration(self):
+        # matrices reach the workers as matrices, so the NUMPY engine still runs there, and stats come back
+        b = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+        b.set_input_type(InputType.ADJACENCY_MATRIX)
+        b.set_engine(Engine.NUMPY)
+        b.generate_input()
+        expected = [b.solve(start) for start in range(6)]
+        stats = SolverStats()
+        b.set_stats(stats)
+        assert b.solve_many(range(6), workers=2) == expected
+        assert stats.counters['rounds'] > 0 and stats.timings['solve'] > 0
+
+        d = DijkstraSolver()
+        d.set_input_type(InputType.CSR)
+        d.set_graph(ErdosRenyiInput(InputType.CSR, 60, 240, seed=1).generate())
+        d.set_engine(Engine.DELTA_STEPPING)
+        d.set_delta(2.0)
+        d.set_cache(ResultCache())
+        stats = SolverStats()
+        d.set_stats(stats)
+        r = parallel.solve_many(d, range(8), workers=2)
+        assert stats.counters['buckets'] > 0 and stats.counters['cache_misses'] == 8
+        assert parallel.solve_many(d, range(8), workers=2) == r and stats.counters['cache_hits'] == 8
+
 class KruskalTests(unittest.TestCase):
     def test_output_type(self):
         # adj matrix input case
@@ -74,6 +404,18 @@ class KruskalTests(unittest.TestCase):
 
         r1, r2 = k1.solve(0), k2.solve(0)
         assert isinstance(r1, list) and isinstance(r2, list)
+
+    def test_stats(self):
+        k = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+        k.set_input_type(InputType.DICTIONARY)
+        k.generate_input()
+        stats = SolverStats()
+        k.set_stats(stats)
+        r = k.solve(0)
+        assert stats.values['total_cost'] == sum(edge[0] for edge in r)
+        assert stats.counters['unions'] >= len(r)
+        assert stats.counters['heap_pops'] >= stats.counters['unions']
+        assert stats.counters['finds'] == 2 * stats.counters['unions']
     
     def test_input_consistency(self):
         k1 = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
@@ -87,6 +429,76 @@ class KruskalTests(unittest.TestCase):
         r1, r2 = k1.solve(0), k2.solve(0)
         assert r1 == r2
 
+    def test_csr_consistency(self):
+        k1 = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+        k1.set_input_type(InputType.DICTIONARY)
+        k1.generate_input()
+
+        k2 = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+        k2.set_input_type(InputType.CSR)
+        k2.generate_input()
+
+        r1, r2 = k1.solve(0), k2.solve(0)
+        assert r1 == r2
+
+    def test_stream(self):
+        k = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+        k.set_input_type(InputType.DICTIONARY)
+        k.generate_input()
+
+        edges = [(item[0], node, item[1]) for node, items in k.graph.items() for item in items]
+        r1 = k.solve(0)
+        r2 = k.solve_stream(iter(edges), len(k.graph))
+        r3 = k._solver.solve_stream(iter(edges), len(k.graph), chunk_size=4)
+        assert r1 == r2 == r3
+        assert len(r1) == len(k.graph) - 1
+
+    def test_incremental_updates(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY):
+            k = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+            k.set_input_type(input_type)
+            k.generate_input()
+            k.solve(0)
+
+            # cheaper edge closes a cycle and displaces the heaviest tree edge on it
+            r = k.insert_edge(0, 4, 1)
+            assert (1, 0, 4) in r and sum(edge[0] for edge in r) == 23
+            # removing a tree edge pulls in the cheapest edge across the cut
+            r = k.delete_edge(5, 6)
+            assert len(r) == 5
+            r = k.insert_edge(4, 6, 2)
+            assert sum(edge[0] for edge in r) == 16
+
+            fresh = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+            fresh.set_input_type(input_type)
+            fresh.generate_input()
+            fresh._solver.set_graph(k.graph)
+            assert set(fresh.solve(0)) == r
+
+    def test_incremental_matches_fresh(self):
+        check_incremental_forest(KruskalSolver)
+
+class BoruvkaTests(unittest.TestCase):
+    def test_matches_kruskal(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            k = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+            k.set_input_type(input_type)
+            k.generate_input()
+            b = AlgorithmsFactory.get_algorithm(AlgorithmType.BORUVKA)
+            b.set_input_type(input_type)
+            b.generate_input()
+            assert b.solve(0) == sorted(k.solve(0))
+
+    def test_random_graphs(self):
+        for seed in range(3):
+            graph = ErdosRenyiInput(InputType.CSR, 200, 600, seed=seed, undirected=True, max_weight=10).generate()
+            k, b = KruskalSolver(), BoruvkaSolver()
+            for solver in (k, b):
+                solver.set_input_type(InputType.CSR)
+                solver.set_graph(graph)
+            r1, r2 = k.solve(0), b.solve(0)
+            assert len(r1) == len(r2) and sum(edge[0] for edge in r1) == sum(edge[0] for edge in r2)
+
 class PrimsTests(unittest.TestCase):
     def test_output_type(self):
         # adj matrix input case
@@ -113,5 +525,438 @@ class PrimsTests(unittest.TestCase):
         r1, r2 = p1.solve(0), p2.solve(0)
         assert r1 == r2
 
+    def test_csr_consistency(self):
+        p1 = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+        p1.set_input_type(InputType.DICTIONARY)
+        p1.generate_input()
+
+        p2 = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+        p2.set_input_type(InputType.CSR)
+        p2.generate_input()
+
+        r1, r2 = p1.solve(0), p2.solve(0)
+        assert r1 == r2
+
+    def test_dense_engines(self):
+        p1 = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+        p1.set_input_type(InputType.ADJACENCY_MATRIX)
+        p1.generate_input()
+        expected = p1.solve(0)
+
+        for engine in (Engine.ARRAY, Engine.NUMPY):
+            p2 = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+            p2.set_input_type(InputType.ADJACENCY_MATRIX)
+            p2.set_engine(engine)
+            p2.generate_input()
+            assert p2.solve(0) == expected
+
+    def test_indexed_heap_engine(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            p1 = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+            p1.set_input_type(input_type)
+            p1.generate_input()
+
+            p2 = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+            p2.set_input_type(input_type)
+            p2.set_engine(Engine.INDEXED_HEAP)
+            p2.generate_input()
+
+            assert p1.solve(0) == p2.solve(0)
+
+    def test_graph_not_mutated(self):
+        p = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+        p.set_input_type(InputType.DICTIONARY)
+        p.generate_input()
+        before = {k: list(v) for k, v in p.graph.items()}
+        p.solve(0)
+        assert p.graph == before
+
+    def test_edit_then_resolve(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY):
+            p = AlgorithmsFactory.get_algorithm(AlgorithmType.PRIMS)
+            p.set_input_type(input_type)
+            p.generate_input()
+            p.solve(0)
+            r = p.insert_edge(0, 4, 1)
+            r = set(p.delete_edge(0, 4))
+            # both directions are written in the undirected layout, so a full solve still reads the graph
+            assert set((edge[0], min(edge[1:]), max(edge[1:])) for edge in p.solve(0)) == r
+
+    def test_incremental_matches_fresh(self):
+        check_incremental_forest(PrimsSolver)
+
+class FloydWarshallTests(unittest.TestCase):
+    def test_matches_bellman_ford(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            f = AlgorithmsFactory.get_algorithm(AlgorithmType.FLOYD_WARSHALL)
+            f.set_input_type(input_type)
+            f.generate_input()
+
+            b = AlgorithmsFactory.get_algorithm(AlgorithmType.BELLMAN_FORD)
+            b.set_input_type(input_type)
+            b.generate_input()
+
+            for start in range(6):
+                assert f.solve(start) == b.solve(start)
+
+    def test_johnson_and_paths(self):
+        f1 = AlgorithmsFactory.get_algorithm(AlgorithmType.FLOYD_WARSHALL)
+        f1.set_input_type(InputType.DICTIONARY)
+        f1.set_predecessors(True)
+        f1.generate_input()
+
+        f2 = AlgorithmsFactory.get_algorithm(AlgorithmType.FLOYD_WARSHALL)
+        f2.set_input_type(InputType.DICTIONARY)
+        f2.set_engine(Engine.JOHNSON)
+        f2.generate_input()
+
+        assert (f1.solve_all() == f2.solve_all()).all()
+        assert f1.path(0, 3) == [0, 5, 4, 1, 3]
+
+class KahnsTests(unittest.TestCase):
+    def test_topological_order(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            k = AlgorithmsFactory.get_algorithm(AlgorithmType.KAHNS)
+            k.set_input_type(input_type)
+            k.generate_input()
+
+            order = k.sort()
+            position = {node: i for i, node in enumerate(order)}
+            nodes, neighbors = adjacency(k.input, input_type)
+            assert sorted(order) == list(nodes)
+            for node in nodes:
+                for _, to_node in neighbors(node):
+                    assert position[node] < position[to_node]
+
+        k._solver.set_graph({0: [(1, 1)], 1: [(1, 0)]})
+        k._solver.set_input_type(InputType.DICTIONARY)
+        with self.assertRaises(ValueError):
+            k.sort()
+
+    def test_dag_paths(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            k = AlgorithmsFactory.get_algorithm(AlgorithmType.KAHNS)
+            k.set_input_type(input_type)
+            k.generate_input()
+
+            b = BellmanFordSolver()
+            b.set_input_type(input_type)
+            b.set_graph(k.input)
+
+            assert k.solve(1) == b.solve(1)
+            assert k.solve(1, longest=True) == {0: -math.inf, 1: 0, 2: 2, 3: 9, 4: 8, 5: 10}
+
+class ConnectivityTests(unittest.TestCase):
+    def test_factory_algorithms(self):
+        for input_type in (InputType.ADJACENCY_MATRIX, InputType.DICTIONARY, InputType.CSR):
+            c = AlgorithmsFactory.get_algorithm(AlgorithmType.CONNECTED_COMPONENTS)
+            c.set_input_type(input_type)
+            c.generate_input()
+            components = c.solve()
+            assert sorted(node for component in components for node in component) == list(range(len(c.input)))
+            assert c.solve(0) in components
+
+            s = AlgorithmsFactory.get_algorithm(AlgorithmType.STRONGLY_CONNECTED_COMPONENTS)
+            s.set_input_type(input_type)
+            s.generate_input()
+            assert sorted(node for component in s.solve() for node in component) == list(range(len(s.input)))
+
+            b = AlgorithmsFactory.get_algorithm(AlgorithmType.BRIDGES)
+            b.set_input_type(input_type)
+            b.generate_input()
+            assert isinstance(b.solve(), list) and isinstance(b.articulation_points(), list)
+
+    def test_deep_graphs(self):
+        # a long cycle and a long path would overflow a recursive DFS
+        n = 20000
+        cycle = CSRGraph.from_edges(n, ((1, node, (node + 1) % n) for node in range(n)))
+        s = StronglyConnectedSolver()
+        s.set_input_type(InputType.CSR)
+        s.set_graph(cycle)
+        assert len(s.solve()) == 1
+
+        path = CSRGraph.from_edges(n, ((1, node, node + 1) for node in range(n - 1)))
+        s.set_graph(path)
+        assert len(s.solve()) == n
+        b = BridgesSolver()
+        b.set_input_type(InputType.CSR)
+        b.set_graph(path)
+        assert len(b.solve()) == n - 1 and b.articulation_points() == list(range(1, n - 1))
+
+class FileInputTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.graph = DijkstraInput(InputType.DICTIONARY).generate()
+        self.edges = [(node, to_node, cost) for node, items in self.graph.items() for cost, to_node in items]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected(self):
+        d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d.set_input_type(InputType.DICTIONARY)
+        d.generate_input()
+        return d.solve(0)
+
+    def solve_from(self, path, input_type):
+        d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d.set_input_type(input_type)
+        d.set_input_factory(FileInputFactory(path, input_type, chunk_size=3))
+        d.generate_input()
+        return d.solve(0)
+
+    def test_text_and_binary_edge_lists(self):
+        csv_path = os.path.join(self.tmp.name, "edges.csv")
+        with open(csv_path, "w") as f:
+            f.write("source,target,weight\n")
+            f.writelines(f"{u},{v},{w}\n" for u, v, w in self.edges)
+        tsv_path = os.path.join(self.tmp.name, "edges.tsv")
+        with open(tsv_path, "w") as f:
+            f.writelines(f"{u}\t{v}\t{w}\n" for u, v, w in self.edges)
+        bin_path = os.path.join(self.tmp.name, "edges.bin")
+        np.array(self.edges, dtype=FileInputFactory.EDGE_RECORD).tofile(bin_path)
+
+        for path in (csv_path, tsv_path, bin_path):
+            for input_type in (InputType.DICTIONARY, InputType.ADJACENCY_MATRIX, InputType.CSR):
+                assert self.solve_from(path, input_type) == self.expected()
+
+    def test_memory_mapped_snapshots(self):
+        csr_path = os.path.join(self.tmp.name, "graph.csr")
+        save_csr(csr_path, CSRGraph.from_dict(self.graph))
+        mat_path = os.path.join(self.tmp.name, "graph.mat")
+        save_matrix(mat_path, DijkstraInput(InputType.ADJACENCY_MATRIX).generate())
+
+        assert self.solve_from(csr_path, InputType.CSR) == self.expected()
+        assert self.solve_from(csr_path, InputType.DICTIONARY) == self.expected()
+        assert self.solve_from(mat_path, InputType.ADJACENCY_MATRIX) == self.expected()
+
+    def test_solve_many_from_file(self):
+        csr_path = os.path.join(self.tmp.name, "graph.csr")
+        save_csr(csr_path, CSRGraph.from_dict(self.graph))
+        snap_path = os.path.join(self.tmp.name, "graph.snap")
+        snapshot.save_graph(snap_path, CSRGraph.from_dict(self.graph), InputType.CSR)
+
+        for graph in (input_factory.load_csr(csr_path), snapshot.load_graph(snap_path)[0]):
+            d = DijkstraSolver()
+            d.set_input_type(InputType.CSR)
+            d.set_graph(graph)
+            starts = list(range(graph.n_nodes))
+            assert parallel.solve_many(d, starts, workers=2) == [d.solve(start) for start in starts]
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trips(self):
+        for i, compress in enumerate((False, True)):
+            graph = ErdosRenyiInput(InputType.CSR, 50, 150, seed=i).generate()
+            path = os.path.join(self.tmp.name, f"graph{i}.snap")
+            snapshot.save_graph(path, graph, InputType.CSR, compress)
+            loaded, input_type = snapshot.load_graph(path)
+            assert input_type == InputType.CSR and loaded.to_dict() == graph.to_dict()
+
+            d = DijkstraSolver()
+            d.set_input_type(InputType.CSR)
+            d.set_graph(loaded)
+            r = d.solve(0)
+            path = os.path.join(self.tmp.name, f"distances{i}.snap")
+            snapshot.save_distances(path, r, compress)
+            restored = snapshot.load_distances(path)
+            assert restored == r and restored.path(7) == r.path(7)
+
+            fw = FloydWarshallSolver()
+            fw.set_input_type(InputType.CSR)
+            fw.set_graph(graph)
+            fw.set_predecessors(True)
+            path = os.path.join(self.tmp.name, f"all_pairs{i}.snap")
+            snapshot.save_all_pairs(path, fw.solve_all(), fw.predecessors(), compress)
+            warm = FloydWarshallSolver()
+            warm.set_input_type(InputType.CSR)
+            warm.set_graph(graph)
+            warm.restore(*snapshot.load_all_pairs(path))
+            assert warm.path(0, 7) == fw.path(0, 7)
+
+    def test_checksums(self):
+        k = AlgorithmsFactory.get_algorithm(AlgorithmType.KRUSKAL)
+        k.set_input_type(InputType.DICTIONARY)
+        k.generate_input()
+        MST = k.solve(0)
+        path = os.path.join(self.tmp.name, "mst.snap")
+        snapshot.save_mst(path, MST)
+        assert snapshot.load_mst(path) == MST
+
+        with open(path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xff]))
+        with self.assertRaises(ValueError):
+            snapshot.load_mst(path)
+
+class RandomGraphTests(unittest.TestCase):
+    def test_layouts_and_seeds(self):
+        for generator in (ErdosRenyiInput, BarabasiAlbertInput, GridInput, DagInput):
+            a = generator(InputType.CSR, 40, 120, seed=7).generate()
+            b = generator(InputType.CSR, 40, 120, seed=7).generate()
+            assert a.to_dict() == b.to_dict() and a.n_nodes == 40
+
+            expected = {node: sorted(items) for node, items in a.to_dict().items()}
+            d = generator(InputType.DICTIONARY, 40, 120, seed=7).generate()
+            m = generator(InputType.ADJACENCY_MATRIX, 40, 120, seed=7).generate()
+            for graph in (CSRGraph.from_dict(d), CSRGraph.from_matrix(m)):
+                assert {node: sorted(items) for node, items in graph.to_dict().items()} == expected
+
+    def test_edge_counts(self):
+        assert ErdosRenyiInput(InputType.CSR, 1000, 5000, seed=1).generate().n_edges == 5000
+        assert GridInput(InputType.CSR, 1000, 3000, seed=1).generate().n_edges == 3000
+        assert ErdosRenyiInput(InputType.CSR, 1000, 5000, seed=1, undirected=True).generate().n_edges == 10000
+
+        k = KahnsSolver()
+        k.set_input_type(InputType.CSR)
+        k.set_graph(DagInput(InputType.CSR, 1000, 5000, seed=1).generate())
+        assert len(k.sort()) == 1000
+
+class BenchmarkTests(unittest.TestCase):
+    def test_suite_and_regressions(self):
+        results = bench.run_suite(sizes=[20], densities=[2], input_types=[InputType.CSR], repeats=1, memory=True)
+        assert {entry["algorithm"] for entry in results["results"]} == {a.name for a in AlgorithmType}
+        assert all(entry["seconds"] > 0 and entry["peak_bytes"] > 0 for entry in results["results"])
+
+        dense = bench.run_suite(sizes=[20], densities=[2], algorithms=[AlgorithmType.BELLMAN_FORD],
+            input_types=[InputType.ADJACENCY_MATRIX], repeats=1)
+        assert all(entry["engine"] == "NUMPY" and entry["peak_bytes"] is None for entry in dense["results"])
+
+        assert bench.compare(results, results) == []
+        slower = {"results": [{**entry, "seconds": entry["seconds"] * 10} for entry in results["results"]]}
+        assert len(bench.compare(slower, results)) == len(results["results"])
+        # a run on another engine is a different benchmark, not a regression of this one
+        switched = {"results": [{**entry, "engine": "OTHER"} for entry in slower["results"]]}
+        assert bench.compare(switched, results) == []
+
+class ServerTests(unittest.TestCase):
+    def test_coalescing_and_deadlines(self):
+        d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d.set_input_type(InputType.DICTIONARY)
+        d.generate_input()
+        expected = d.solve(0)
+
+        async def scenario():
+            s = server.QueryServer(max_pending=1)
+            s.register("roads", d)
+            results = await asyncio.gather(*(s.query("roads", 0) for _ in range(5)))
+            assert all(r == expected for r in results)
+            assert s.stats['solved'] == 1 and s.stats['coalesced'] == 4
+
+            listener = await s.serve(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for i, request in enumerate([{"graph": "roads", "start": 0, "target": 4}, {"graph": "missing", "start": 0}]):
+                writer.write(json.dumps({"id": i, **request}).encode() + b"\n")
+            await writer.drain()
+            replies = {reply["id"]: reply for reply in [json.loads(await reader.readline()) for _ in range(2)]}
+            writer.close()
+            listener.close()
+            s.close()
+            assert replies[0]["result"] == {"4": expected[4]} and "error" in replies[1]
+
+        asyncio.run(scenario())
+
+    def test_expired_queries_are_not_solved(self):
+        d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d.set_input_type(InputType.DICTIONARY)
+        d.generate_input()
+
+        async def scenario():
+            s = server.QueryServer(max_pending=1)
+            s.register("roads", d)
+            # holding the graph lock keeps both solves queued until their callers have given up
+            await s._locks["roads"].acquire()
+            for start in (0, 1):
+                with self.assertRaises(asyncio.TimeoutError):
+                    await s.query("roads", start, deadline=0.01)
+            s._locks["roads"].release()
+            assert await s.query("roads", 2) == d.solve(2)
+            s.close()
+            assert s.stats['timeouts'] == 2 and s.stats['rejected'] == 0
+            assert s.stats['expired'] == 2 and s.stats['solved'] == 1
+
+        asyncio.run(scenario())
+
+class UnionFindTests(unittest.TestCase):
+    def test_long_chain(self):
+        n = 100000
+        uf = UnionFind(n)
+        for i in range(n - 1):
+            uf.union(i, i + 1)
+        assert uf.find(0) == uf.find(n - 1)
+        assert not uf.union(0, n - 1)
+
+    def test_find_many(self):
+        uf = UnionFind(6)
+        assert [uf.union(x, y) for x, y in [(0, 1), (2, 3), (1, 0), (3, 4)]] == [True, True, False, True]
+        roots = uf.find_many([0, 1, 2, 3, 4, 5])
+        assert roots[0] == roots[1] and roots[2] == roots[3] == roots[4]
+        assert len({int(r) for r in roots}) == 3
+
+class ResultCacheTests(unittest.TestCase):
+    def test_hits_and_invalidation(self):
+        cache = ResultCache(max_entries=8)
+        d = AlgorithmsFactory.get_algorithm(AlgorithmType.DIJKSTRA)
+        d.set_input_type(InputType.DICTIONARY)
+        d.set_cache(cache)
+        d.generate_input()
+
+        r1 = d.solve(0)
+        r2 = d.solve(0)
+        assert r1 == r2 and cache.hits == 1 and cache.misses == 1
+
+        stats = SolverStats()
+        d.set_stats(stats)
+        assert d.solve(0) == r1 and stats.counters['cache_hits'] == 1 and stats.timings['solve'] > 0
+
+        d._solver.set_graph({0: [(1, 1)], 1: []})
+        assert len(cache) == 0
+        assert d.solve(0) == {0: 0, 1: 1}
+
+    def test_large_matrices(self):
+        # the two matrices only differ away from the corners a truncated repr would show
+        cache = ResultCache()
+        a = np.full((1200, 1200), math.inf)
+        np.fill_diagonal(a, 0)
+        a[0][1000] = a[1000][0] = 1
+        b = a.copy()
+        b[0][1000] = b[1000][0] = 2
+        results = []
+        for matrix in (a, b):
+            d = DijkstraSolver()
+            d.set_input_type(InputType.ADJACENCY_MATRIX)
+            d.set_cache(cache)
+            d.set_graph(matrix)
+            results.append(d.solve(0, 1000))
+        assert cache.misses == 2 and [r[1000] for r in results] == [1, 2]
+
+    def test_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for start in range(3):
+            cache.put(("g", "Solver", start), {start: 0})
+        assert len(cache) == 2 and cache.get(("g", "Solver", 0)) is None
+
+        cache = ResultCache(max_bytes=2000)
+        for start in range(20):
+            cache.put(("g", "Solver", start), {start: 0})
+        assert cache.n_bytes <= 2000 and 0 < len(cache) < 20
+
+class IndexedHeapTests(unittest.TestCase):
+    def test_decrease_key(self):
+        heap = IndexedHeap(5)
+        for node, key in [(0, 5), (1, 3), (2, 8), (3, 1)]:
+            heap.push(node, key)
+        heap.decrease_key(2, 0)
+        assert len(heap) == 4 and 4 not in heap
+        assert [heap.pop() for _ in range(4)] == [(0, 2), (1, 3), (3, 1), (5, 0)]
+
 if __name__=="__main__":
     unittest.main()
\ No newline at end of file
@@ -1,15 +1,251 @@
+from array import array
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+import hashlib
+import sys
+import time
+import numpy as np
 
 class UnionFind:
     def __init__(self, n):
-        self.parent = list(range(n))
+        self.parent = array('q', range(n))
+        self.rank = array('B', bytes(n))
+        # zero-copy view over the same buffer for the bulk helpers
+        self._parent_view = np.frombuffer(self.parent, dtype=np.int64) if n else np.zeros(0, dtype=np.int64)
 
     def find(self, x):
-        if self.parent[x] == x:
-            return x
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
 
-        return self.find(self.parent[x])
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+
+        return root
 
     def union(self, x, y):
         r1 = self.find(x)
         r2 = self.find(y)
-        self.parent[r1] = r2
\ No newline at end of file
+        if r1 == r2:
+            return False
+
+        rank = self.rank
+        if rank[r1] < rank[r2]:
+            r1, r2 = r2, r1
+        self.parent[r2] = r1
+        if rank[r1] == rank[r2]:
+            rank[r1] += 1
+        return True
+
+    def find_many(self, xs):
+        parent = self._parent_view
+        xs = np.asarray(xs, dtype=np.int64)
+        roots = parent[xs]
+        # pointer jumping over the whole batch until every entry is a root
+        while True:
+            up = parent[roots]
+            if np.array_equal(up, roots):
+                break
+            roots = up
+        parent[xs] = roots
+        return roots
+
+class IndexedHeap:
+    def __init__(self, n):
+        self.heap = array('q')
+        self.pos = array('q', [-1]) * n
+        self.key = [None] * n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, node):
+        return self.pos[node] >= 0
+
+    def push(self, node, key):
+        if self.pos[node] >= 0:
+            raise KeyError(f"{node} is already queued")
+        self.key[node] = key
+        self.heap.append(node)
+        self.pos[node] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def decrease_key(self, node, key):
+        if self.pos[node] < 0:
+            raise KeyError(f"{node} is not queued")
+        if key > self.key[node]:
+            raise ValueError("New key is larger than the current key")
+        self.key[node] = key
+        self._sift_up(self.pos[node])
+
+    def peek(self):
+        node = self.heap[0]
+        return self.key[node], node
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        node = heap[0]
+        last = heap.pop()
+        pos[node] = -1
+        if heap:
+            heap[0] = last
+            pos[last] = 0
+            self._sift_down(0)
+        return self.key[node], node
+
+    # entries order by (key, node) so ties resolve the same way as heapq tuples
+    def _sift_up(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        node = heap[i]
+        entry = (key[node], node)
+        while i > 0:
+            parent = (i - 1) >> 1
+            above = heap[parent]
+            if (key[above], above) <= entry:
+                break
+            heap[i] = above
+            pos[above] = i
+            i = parent
+        heap[i] = node
+        pos[node] = i
+
+    def _sift_down(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        size = len(heap)
+        node = heap[i]
+        entry = (key[node], node)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and (key[heap[right]], heap[right]) < (key[heap[child]], heap[child]):
+                child = right
+            below = heap[child]
+            if entry <= (key[below], below):
+                break
+            heap[i] = below
+            pos[below] = i
+            i = child
+        heap[i] = node
+        pos[node] = i
+
+def graph_fingerprint(graph):
+    digest = hashlib.blake2b(digest_size=16)
+    if hasattr(graph, 'offsets'):
+        for buffer in (graph.offsets, graph.targets, graph.weights):
+            digest.update(memoryview(buffer).cast('B'))
+            digest.update(b'|')
+    elif isinstance(graph, dict):
+        # streamed per node, so a large graph is never rendered as one string
+        for node, items in graph.items():
+            digest.update(repr((node, items)).encode())
+    else:
+        # repr() elides the middle of large arrays, so the raw cells are hashed
+        matrix = np.ascontiguousarray(graph)
+        digest.update(f'{matrix.dtype.str}{matrix.shape}'.encode())
+        digest.update(matrix.data)
+    return digest.hexdigest()
+
+def result_size(result):
+    size = sys.getsizeof(result)
+    if isinstance(result, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in result.items())
+    elif isinstance(result, list):
+        size += sum(sys.getsizeof(item) for item in result)
+    if getattr(result, 'predecessors', None) is not None:
+        size += sys.getsizeof(result.predecessors)
+    return size
+
+class ResultCache:
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.by_graph = {}
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        if key in self.entries:
+            self._remove(key)
+        size = result_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self.entries[key] = (value, size)
+        self.by_graph.setdefault(key[0], set()).add(key)
+        self.n_bytes += size
+        while len(self.entries) > self.max_entries or (self.max_bytes is not None and self.n_bytes > self.max_bytes):
+            self._remove(next(iter(self.entries)))
+
+    def invalidate(self, fingerprint):
+        for key in list(self.by_graph.get(fingerprint, ())):
+            self._remove(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.by_graph.clear()
+        self.n_bytes = 0
+
+    # keys are (graph fingerprint, ...) so whole graphs can be dropped at once
+    def _remove(self, key):
+        _, size = self.entries.pop(key)
+        self.n_bytes -= size
+        keys = self.by_graph[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.by_graph[key[0]]
+
+class SolverStats:
+    def __init__(self):
+        self.counters = Counter()
+        self.timings = {}
+        self.values = {}
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def counting(self, func, name):
+        # solvers bind their primitives to locals, so only traced runs pay for this wrapper
+        counters = self.counters
+        def counted(*args):
+            counters[name] += 1
+            return func(*args)
+        return counted
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def merge(self, other):
+        # folds in stats gathered elsewhere, e.g. by worker processes
+        self.counters.update(other.counters)
+        for name, seconds in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.values.update(other.values)
+
+    def reset(self):
+        self.counters.clear()
+        self.timings.clear()
+        self.values.clear()
+
+    def as_dict(self):
+        return {"counters": dict(self.counters), "timings": dict(self.timings), "values": dict(self.values)}